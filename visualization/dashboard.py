@@ -3,32 +3,693 @@ Visualization Dashboard Module
 Generates charts and reports for AI funding risk assessment
 Extended to support the Early Warning System
 """
+import gzip
+import hashlib
+import io
 import json
+import os
+import re
+import struct
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import chain
+from operator import itemgetter
 from pathlib import Path
+from types import MappingProxyType
 from datetime import datetime
-from typing import Dict, List, Optional
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
 import sys
 
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from config.settings import PROCESSED_DATA_DIR, MARKET_DATA_DIR, RISK_LEVELS, ALERT_LEVELS
 
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+from markupsafe import Markup
+
 try:
-    import matplotlib.pyplot as plt
+    import matplotlib
+    # Charts are only ever saved to PNG; Agg skips GUI backend discovery and setup
+    matplotlib.use("Agg")
+    from matplotlib.figure import Figure
     import matplotlib.patches as mpatches
+    from matplotlib.collections import PolyCollection
+    # numpy is a matplotlib dependency, so it is available whenever plotting is
+    import numpy as np
     MATPLOTLIB_AVAILABLE = True
 except ImportError:
     MATPLOTLIB_AVAILABLE = False
     print("Warning: matplotlib not available. Install with: pip install matplotlib")
 
+try:
+    # Optional: native JSON parser for the load_* methods
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    # Optional: lets load_credit_market stream just the requested series out of a large file
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+TEMPLATES_DIR = Path(__file__).parent / "templates"
+# Charts drawn by an older version of this module are redrawn (see RiskDashboard.render_charts)
+_MODULE_PATH = Path(__file__)
+
+
+def _template_bytecode_cache() -> Optional[FileSystemBytecodeCache]:
+    """Jinja2's per-user cache in the temp directory, or None if it cannot be set up safely"""
+    try:
+        return FileSystemBytecodeCache()
+    except (OSError, RuntimeError):
+        return None
+
+
+# Templates are compiled once per process; auto_reload is off since they ship with the code.
+# Compiled bytecode is also cached on disk, so later runs skip parsing and compiling them
+_TEMPLATE_ENV = Environment(
+    loader=FileSystemLoader(str(TEMPLATES_DIR)),
+    bytecode_cache=_template_bytecode_cache(),
+    autoescape=True,
+    auto_reload=False,
+    trim_blocks=True,
+    lstrip_blocks=True,
+)
+
+# Health score colors indexed by how many of the 50/70 thresholds a score reaches
+_SCORE_COLORS = ("#dc3545", "#ffc107", "#28a745")
+
+
+def _score_color(score: float) -> str:
+    """Color for a 0-100 health score: red below 50, yellow below 70, green otherwise"""
+    return _SCORE_COLORS[(score >= 50) + (score >= 70)]
+
+
+@lru_cache(maxsize=8)
+def _format_epoch(epoch_sec: int, fmt: str) -> str:
+    return datetime.fromtimestamp(epoch_sec).strftime(fmt)
+
+
+def _timestamp(fmt: str) -> str:
+    """Current local time formatted with `fmt`; reports generated in the same second share one strftime"""
+    return _format_epoch(int(time.time()), fmt)
+
+
+def _fmt_num(value) -> str:
+    """Format numbers to two decimals and pass anything else (e.g. 'N/A') through as text"""
+    return f"{value:.2f}" if isinstance(value, (int, float)) else str(value)
+
+
+_TEMPLATE_ENV.globals["score_color"] = _score_color
+
+# PNG written by each plot_* method
+CHART_FILES = {
+    "plot_company_risk_comparison": "company_risk_comparison.png",
+    "plot_risk_breakdown": "risk_breakdown.png",
+    "plot_indicator_heatmap": "indicator_heatmap.png",
+    "plot_scenario_projections": "scenario_projections.png",
+    "plot_warning_signals": "warning_signals.png",
+    "plot_supply_demand_projection": "supply_demand_projection.png",
+    "plot_funding_health_gauge": "funding_health_gauge.png",
+    "plot_credit_market_trends": "credit_market_trends.png",
+}
+
+# Upper bound on worker processes rendering charts in parallel (see RiskDashboard.render_charts)
+CHART_WORKERS = 8
+
+# Write buffer for reports streamed to disk chunk by chunk
+HTML_WRITE_BUFFER = 64 * 1024
+
+ALERT_ICONS = {"GREEN": "✓", "YELLOW": "⚠", "ORANGE": "⚡", "RED": "🚨"}
+ALERT_COLORS = {"GREEN": "#28a745", "YELLOW": "#ffc107", "ORANGE": "#fd7e14", "RED": "#dc3545"}
+
+
+@dataclass(frozen=True)
+class AlertStyle:
+    """Display attributes of an alert level"""
+    icon: str
+    label: str
+    description: str
+    color: str
+
+
+ALERT_STYLES = {
+    level: AlertStyle(
+        icon=ALERT_ICONS.get(level, "●"),
+        label=info.get("label", level),
+        description=info.get("description", ""),
+        color=ALERT_COLORS.get(level, "#6c757d"),
+    )
+    for level, info in ALERT_LEVELS.items()
+}
+
+
+@lru_cache(maxsize=16)
+def _fallback_alert_style(alert_level: str) -> AlertStyle:
+    """Neutral style for a level missing from ALERT_LEVELS, built once per such level"""
+    return AlertStyle(icon="●", label=alert_level, description="", color="#6c757d")
+
+
+def _alert_style(alert_level: str) -> AlertStyle:
+    """Look up the display style of an alert level, with a neutral fallback for unknown levels"""
+    return ALERT_STYLES.get(alert_level) or _fallback_alert_style(alert_level)
+
+
+# Largest indicator heatmap that still gets a score label in every cell
+HEATMAP_MAX_LABELED_CELLS = 200
+# Largest indicator heatmap inlined into the risk report as SVG; bigger ones stay PNG-only
+HEATMAP_MAX_SVG_CELLS = 300
+
+# Credit market series plotted by plot_credit_market_trends, in panel order
+CREDIT_TREND_SERIES = ("BAMLH0A0HYM2", "BAMLC0A0CM", "T10Y2Y", "DFF")
+# Most points drawn per credit market panel; longer daily histories are thinned to this
+CREDIT_TREND_MAX_POINTS = 2000
+
+# Fiscal years covered by the company historical dashboard
+HISTORICAL_YEARS = (2021, 2022, 2023, 2024, 2025)
+# (year, JSON object key) pairs and table header cells, built once at import
+_HISTORICAL_YEAR_KEYS = tuple((year, str(year)) for year in HISTORICAL_YEARS)
+_HISTORICAL_YEAR_HEADERS = "".join(f"<th>{year}</th>" for year in HISTORICAL_YEARS)
+
+# (JS field, consolidated_data key) pairs for the company historical dashboard
+OCF_BREAKDOWN_FIELDS = (
+    ("netIncome", "net_income"),
+    ("depreciation", "depreciation"),
+    ("stockComp", "stock_compensation"),
+    ("workingCapital", "working_capital"),
+    ("deferredTax", "deferred_tax"),
+    ("other", "other"),
+)
+FUNDING_FIELDS = (
+    ("capex", "capex"),
+    ("ocf", "ocf"),
+    ("fcf", "free_cashflow"),
+    ("debtIssue", "debt_issuance"),
+    ("debtPayment", "debt_payment"),
+    ("stockIssue", "stock_issuance"),
+    ("buyback", "stock_repurchase"),
+    ("dividend", "dividends"),
+)
+
+# (label, companyData key, colour) stacks of the historical dashboard bar charts
+OCF_COMPONENTS = (
+    ("Net Income", "netIncome", "#51cf66"),
+    ("D&A", "depreciation", "#4dabf7"),
+    ("Stock Comp", "stockComp", "#be4bdb"),
+    ("Working Capital", "workingCapital", "#fcc419"),
+    ("Deferred Tax", "deferredTax", "#ff6b6b"),
+    ("Other", "other", "#868e96"),
+)
+ALLOCATION_COMPONENTS = (
+    ("CapEx", "capex", "#4dabf7"),
+    ("Buybacks", "buyback", "#be4bdb"),
+    ("Dividends", "dividend", "#fcc419"),
+)
+
+# (metric, companyData field, per-year record key) behind each historical line chart series
+LINE_SERIES_FIELDS = (
+    ("capex", "capex", None),
+    ("ocf", "ocf", None),
+    ("netIncome", "ocfBreakdown", "netIncome"),
+    ("depreciation", "ocfBreakdown", "depreciation"),
+    ("stockComp", "ocfBreakdown", "stockComp"),
+    ("workingCapital", "ocfBreakdown", "workingCapital"),
+    ("deferredTax", "ocfBreakdown", "deferredTax"),
+    ("other", "ocfBreakdown", "other"),
+    ("fundingCapex", "funding", "capex"),
+    ("fcf", "funding", "fcf"),
+    ("debtIssue", "funding", "debtIssue"),
+    ("buyback", "funding", "buyback"),
+    ("dividend", "funding", "dividend"),
+    ("stockIssue", "funding", "stockIssue"),
+    ("debtPayment", "funding", "debtPayment"),
+)
+
+# Badge color for each supply-demand risk level; anything unrecognized shows as RED
+_RISK_BADGE = {"LOW": "GREEN", "MEDIUM": "YELLOW", "HIGH": "RED"}
+
+# Shared read-only stand-in for a missing nested section of the input JSON
+_EMPTY = MappingProxyType({})
+
+# Sort order for elevated signals, most severe first; any other level ranks last
+_ALERT_RANK = {"RED": 0, "ORANGE": 1, "YELLOW": 2}
+_ALERT_RANK_LAST = len(_ALERT_RANK)
+
+# Field accessors for the per-record loops in the plot methods, bound once
+_get_score = itemgetter("overall_risk_score")
+_get_company_name = itemgetter("company_name")
+_profile_bar = itemgetter("company_name", "overall_risk_score", "risk_level")
+_balance_point = itemgetter("year", "demand_B", "supply_B", "gap_B")
+_observation = itemgetter("date", "value")
+
+
+def _rank_profiles(assessment: Dict) -> List[Dict]:
+    """Company profiles ordered by overall risk score, highest first"""
+    return sorted(assessment.get("company_profiles", []), key=_get_score, reverse=True)
+
+
+def _columns(records: List[Dict], getter, width: int) -> List[List]:
+    """Transpose records into one list per field picked by an itemgetter of `width` fields"""
+    return [list(column) for column in zip(*map(getter, records))] or [[] for _ in range(width)]
+
+
+# Static parts of the risk assessment report (generate_html_report)
+_REPORT_CSS = """    <style>
+        body { font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
+               margin: 0; padding: 20px; background: #f5f5f5; }
+        .container { max-width: 1200px; margin: 0 auto; background: white;
+                    padding: 30px; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }
+        h1 { color: #1a1a1a; border-bottom: 2px solid #007bff; padding-bottom: 10px; }
+        h2 { color: #333; margin-top: 30px; }
+        .risk-badge { display: inline-block; padding: 5px 15px; border-radius: 20px;
+                     font-weight: bold; color: white; }
+        .risk-LOW { background: #28a745; }
+        .risk-MEDIUM { background: #ffc107; color: #1a1a1a; }
+        .risk-HIGH { background: #dc3545; }
+        .score-box { background: #f8f9fa; padding: 20px; border-radius: 8px;
+                    margin: 20px 0; text-align: center; }
+        .score-value { font-size: 48px; font-weight: bold; color: #1a1a1a; }
+        .score-label { font-size: 14px; color: #666; }
+        .grid { display: grid; grid-template-columns: repeat(auto-fit, minmax(250px, 1fr)); gap: 20px; }
+        .card { background: #f8f9fa; padding: 15px; border-radius: 8px; }
+        .card h3 { margin-top: 0; color: #333; font-size: 16px; }
+        table { width: 100%; border-collapse: collapse; margin: 20px 0; }
+        th, td { padding: 12px; text-align: left; border-bottom: 1px solid #ddd; }
+        th { background: #f8f9fa; font-weight: 600; }
+        .finding { padding: 10px; margin: 5px 0; background: #fff3cd;
+                  border-left: 4px solid #ffc107; border-radius: 4px; }
+        .recommendation { padding: 10px; margin: 5px 0; background: #d4edda;
+                         border-left: 4px solid #28a745; border-radius: 4px; }
+        .chart-container { margin: 20px 0; text-align: center; }
+        .chart-container svg { max-width: 100%; height: auto; }
+        .chart-container svg * { stroke-linejoin: round; stroke-linecap: butt; }
+        .chart-container img { max-width: 100%; height: auto; border-radius: 8px;
+                              box-shadow: 0 2px 4px rgba(0,0,0,0.1); }
+        .footer { margin-top: 40px; padding-top: 20px; border-top: 1px solid #ddd;
+                 color: #666; font-size: 12px; }
+    </style>
+"""
+
+_REPORT_HEADER_HTML = f"""
+<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>AI Funding Risk Assessment Report</title>
+{_REPORT_CSS}</head>
+<body>
+    <div class="container">
+"""
+
+_REPORT_PROFILES_HEAD_HTML = """
+        <h2>Company Risk Profiles</h2>
+        <table>
+            <thead>
+                <tr>
+                    <th>Company</th>
+                    <th>Ticker</th>
+                    <th>Risk Score</th>
+                    <th>Risk Level</th>
+                    <th>Summary</th>
+                </tr>
+            </thead>
+            <tbody>
+"""
+
+# Per-item report fragments, bound to str.format_map/str.format once at import
+_REPORT_COMPANY_ROW = """
+                <tr>
+                    <td>{company_name}</td>
+                    <td>{ticker}</td>
+                    <td>{overall_risk_score:.0f}</td>
+                    <td><span class="risk-badge risk-{risk_level}">{risk_level}</span></td>
+                    <td>{summary}</td>
+                </tr>
+""".format_map
+_REPORT_FINDING = '        <div class="finding">{}</div>\n'.format
+_REPORT_RECOMMENDATION = '        <div class="recommendation">{}</div>\n'.format
+_REPORT_CHART = """
+        <div class="chart-container">
+            <h3>{1}</h3>
+            <img src="{0}" alt="{1}"{2} loading="lazy" decoding="async">
+        </div>
+""".format
+_REPORT_CHART_SVG = """
+        <div class="chart-container">
+            <h3>{0}</h3>
+{1}
+        </div>
+""".format
+
+_REPORT_PROFILES_FOOT_HTML = """
+            </tbody>
+        </table>
+"""
+
+_REPORT_FOOTER_HTML = """
+        <div class="footer">
+            <p>This report is generated automatically based on publicly available financial data.
+            It is intended for informational purposes only and should not be considered financial advice.</p>
+            <p>Data sources: SEC EDGAR, FRED, Yahoo Finance</p>
+        </div>
+    </div>
+</body>
+</html>
+"""
+
+# The static report parts are encoded once at import and written as bytes
+_REPORT_HEADER_BYTES = _REPORT_HEADER_HTML.encode("utf-8")
+_REPORT_PROFILES_HEAD_BYTES = _REPORT_PROFILES_HEAD_HTML.encode("utf-8")
+_REPORT_PROFILES_FOOT_BYTES = _REPORT_PROFILES_FOOT_HTML.encode("utf-8")
+_REPORT_FOOTER_BYTES = _REPORT_FOOTER_HTML.encode("utf-8")
+
+# Company historical dashboard page, read once at import. Every __NAME__ sentinel is plain text
+# (string.Template's $-placeholders would collide with the page's JS template literals); the
+# year sentinels are filled here, the rest per call by generate_company_historical_html.
+_COMPANY_HISTORICAL_TEMPLATE = (
+    (TEMPLATES_DIR / "company_historical.html").read_text(encoding="utf-8")
+    .replace("__YEAR_HEADERS__", _HISTORICAL_YEAR_HEADERS)
+    .replace("__YEARS_JSON__", json.dumps(list(HISTORICAL_YEARS)))
+)
+
+# Per-call sentinels of the company historical page, in document order
+_COMPANY_HISTORICAL_SENTINELS = (
+    "__TIMESTAMP__", "__COMPANY_DATA_JSON__", "__SERIES_CACHE_JSON__", "__CHART_DATA_JSON__", "__TABLE_ROWS_JSON__",
+)
+
+
+def _split_template(template: str, sentinels: Tuple[str, ...]) -> Tuple[str, ...]:
+    """Cut a template at each sentinel, in order, into the static text around them"""
+    parts = []
+    rest = template
+    for sentinel in sentinels:
+        head, found, rest = rest.partition(sentinel)
+        if not found:
+            raise ValueError(f"Template is missing the {sentinel} sentinel")
+        parts.append(head)
+    parts.append(rest)
+    return tuple(parts)
+
+
+# Static text between the per-call sentinels, split once so pages can be streamed piece by piece
+_COMPANY_HISTORICAL_PARTS = _split_template(_COMPANY_HISTORICAL_TEMPLATE, _COMPANY_HISTORICAL_SENTINELS)
+
+# Compact encoder for the page's application/json blocks
+_COMPACT_JSON = json.JSONEncoder(separators=(",", ":"))
+
+
+def _build_line_series(company_data: Dict) -> Dict:
+    """Per-metric, per-company {x: year, y: value} points for the line charts, skipping years without data"""
+    series = {}
+    for metric, field, key in LINE_SERIES_FIELDS:
+        by_company = series[metric] = {}
+        for name, data in company_data.items():
+            by_year = data[field]
+            points = by_company[name] = []
+            for year, year_key in _HISTORICAL_YEAR_KEYS:
+                value = by_year.get(year_key)
+                if key is not None and value is not None:
+                    value = value.get(key)
+                if value is not None:
+                    points.append({"x": year, "y": value})
+    return series
+
+
+def _build_chart_payload(company_data: Dict) -> Dict:
+    """Chart.js-ready labels and datasets for the comparison and percentage-of-OCF bar charts"""
+    companies = list(company_data)
+    latest = {name: str(data["latestYear"]) for name, data in company_data.items()}
+
+    def comparison(field, components):
+        datasets = []
+        for label, key, color in components:
+            values = [(company_data[name][field].get(latest[name]) or {}).get(key) or 0 for name in companies]
+            datasets.append({"label": label, "data": values, "backgroundColor": color})
+        return {"labels": companies, "datasets": datasets}
+
+    def percent_of_ocf(data, field, components):
+        years = data["availableYears"]
+        ocf = [data["ocf"].get(str(year)) for year in years]
+        datasets = []
+        for label, key, color in components:
+            values = [(data[field].get(str(year)) or {}).get(key) or 0 for year in years]
+            pct = [value / total * 100 if total else 0 for value, total in zip(values, ocf)]
+            datasets.append({"label": label, "data": pct, "backgroundColor": color,
+                             "borderColor": color, "borderWidth": 1})
+        return {"labels": years, "datasets": datasets}
+
+    return {
+        "ocfComparison": comparison("ocfBreakdown", OCF_COMPONENTS),
+        "allocationComparison": comparison("funding", ALLOCATION_COMPONENTS),
+        "ocfPct": {name: percent_of_ocf(data, "ocfBreakdown", OCF_COMPONENTS) for name, data in company_data.items()},
+        "fundingPct": {name: percent_of_ocf(data, "funding", ALLOCATION_COMPONENTS) for name, data in company_data.items()},
+    }
+
+
+def _to_fixed(value: float, digits: int) -> str:
+    """Format like JavaScript's Number.prototype.toFixed, which rounds exact ties away from zero"""
+    if not value:
+        value = 0.0  # toFixed prints -0 as "0"
+    return str(Decimal(value).quantize(Decimal(1).scaleb(-digits), rounding=ROUND_HALF_UP))
+
+
+def _growth_cell(values: List) -> str:
+    """Growth <td> for the main table: change between the last two reported values"""
+    reported = [value for value in values if value is not None]
+    if len(reported) < 2 or not reported[-2]:
+        return "<td class=\"\">-</td>"
+    growth = _to_fixed((reported[-1] - reported[-2]) / reported[-2] * 100, 1)
+    sign = float(growth)
+    css = "growth-positive" if sign > 0 else "growth-negative" if sign < 0 else ""
+    return f'<td class="{css}">{"+" if sign > 0 else ""}{growth}%</td>'
+
+
+def _ocf_breakdown_row(label: str, b: Dict) -> str:
+    """OCF breakdown table row; negative components are shown in red"""
+    values = {key: b.get(key) or 0 for _, key, _ in OCF_COMPONENTS}
+    total = sum(values.values())
+
+    def signed(key):
+        css = "growth-positive" if values[key] >= 0 else "growth-negative"
+        return f'<td class="{css}">${_to_fixed(values[key], 2)}B</td>'
+
+    return (f"<tr><td>{label}</td>{signed('netIncome')}<td>${_to_fixed(values['depreciation'], 2)}B</td>"
+            f"<td>${_to_fixed(values['stockComp'], 2)}B</td>{signed('workingCapital')}{signed('deferredTax')}"
+            f"<td>${_to_fixed(values['other'], 2)}B</td><td style=\"font-weight:600\">${_to_fixed(total, 2)}B</td></tr>")
+
+
+def _funding_row(label: str, f: Dict) -> str:
+    """Funding table row: capex, OCF with capex coverage, FCF and optional financing flows"""
+    capex, ocf, fcf = (f.get(key) or 0 for key in ("capex", "ocf", "fcf"))
+    coverage = _to_fixed(ocf / capex * 100, 0) if capex else "-"
+
+    def optional(key):
+        value = f.get(key) or 0
+        return f"<td>${_to_fixed(value, 2)}B</td>" if value > 0 else "<td>-</td>"
+
+    fcf_css = "growth-positive" if fcf >= 0 else "growth-negative"
+    return (f"<tr><td>{label}</td><td>${_to_fixed(capex, 2)}B</td>"
+            f"<td>${_to_fixed(ocf, 2)}B <span style=\"color:#868e96;font-size:0.8em\">({coverage}%)</span></td>"
+            f'<td class="{fcf_css}">${_to_fixed(fcf, 2)}B</td>{optional("debtIssue")}{optional("buyback")}'
+            f"{optional('dividend')}</tr>")
+
+
+def _build_table_rows(company_data: Dict) -> Dict:
+    """Pre-rendered <tr> markup for the data tables, keyed by company"""
+    rows = {"main": {}, "ocfLatest": {}, "ocfByYear": {}, "fundingLatest": {}, "fundingByYear": {}}
+    for name, data in company_data.items():
+        dot = f'<span style="color:{data["color"]}">●</span>'
+        main = []
+        for metric, label, first_cell in (("capex", "CapEx", f"{dot} {name}"), ("ocf", "OCF", "")):
+            values = [data[metric][key] for _, key in _HISTORICAL_YEAR_KEYS]
+            cells = "".join("<td>-</td>" if value is None else f"<td>${_to_fixed(value, 1)}B</td>" for value in values)
+            main.append(f"<tr><td>{first_cell}</td><td>{label}</td>{cells}{_growth_cell(values)}</tr>")
+        rows["main"][name] = "".join(main)
+
+        latest = str(data["latestYear"])
+        breakdown, funding = data["ocfBreakdown"], data["funding"]
+        if latest in breakdown:
+            rows["ocfLatest"][name] = _ocf_breakdown_row(f"{dot} {name} ({latest})", breakdown[latest])
+        if latest in funding:
+            rows["fundingLatest"][name] = _funding_row(f"{dot} {name} ({latest})", funding[latest])
+        years = [str(year) for year in data["availableYears"]]
+        rows["ocfByYear"][name] = "".join(_ocf_breakdown_row(f"{dot} {year}", breakdown[year]) for year in years)
+        rows["fundingByYear"][name] = "".join(
+            _funding_row(f"{dot} {year}", funding[year]) for year in years if year in funding
+        )
+    return rows
+
+
+def _format_growth(growth_pct: Optional[float]) -> Optional[str]:
+    """Format a growth percentage with an explicit sign, or None if missing"""
+    if growth_pct is None:
+        return None
+    return f"+{growth_pct:.1f}%" if growth_pct >= 0 else f"{growth_pct:.1f}%"
+
+
+@lru_cache(maxsize=16)
+def _badge(color: str, label: str) -> Markup:
+    """Severity badge markup; only a few color/label pairs occur, so each is built once"""
+    return Markup('<span class="signal-badge badge-{}">{}</span>').format(color, label)
+
+
+def _format_supply_demand_rows(rows: List[Dict]) -> List[Dict]:
+    """Pre-format supply-demand rows into display strings for the warning dashboard table"""
+    formatted = []
+    for row in rows:
+        get = row.get
+        gap_b = get("gap_B", 0)
+        risk_level = get("risk_level", "N/A")
+        formatted.append({
+            "year": get("year", "N/A"),
+            "demand": f"${get('demand_B', 0):.0f}",
+            "demand_growth": _format_growth(get("demand_growth_pct")),
+            "supply": f"${get('supply_B', 0):.0f}",
+            "supply_growth": _format_growth(get("supply_growth_pct")),
+            "gap": f"${gap_b:+.0f}",
+            "gap_class": "positive" if gap_b > 0 else "negative",
+            "status": get("status", "N/A").upper(),
+            "badge": _badge(_RISK_BADGE.get(risk_level, "RED"), risk_level),
+        })
+    return formatted
+
+
+def _format_signal_rows(signals: List[Dict]) -> List[Dict]:
+    """Pre-format elevated signals into display strings for the warning dashboard table"""
+    formatted = []
+    for signal in signals:
+        get = signal.get
+        level = get("alert_level", "GREEN")
+        formatted.append({
+            "name": get("signal_name", "Unknown"),
+            "category": get("category", "N/A").upper(),
+            "value": _fmt_num(get("current_value", "N/A")),
+            "threshold": _fmt_num(get("threshold", "N/A")),
+            "badge": _badge(level, level),
+        })
+    return formatted
+
+
+def _svg_name(filename: str) -> str:
+    """Name of the inline SVG copy of a chart PNG"""
+    return os.path.splitext(filename)[0] + ".svg"
+
+
+def _png_size(filepath: str) -> Optional[Tuple[int, int]]:
+    """Pixel (width, height) of a PNG, read from its IHDR header; None if the file is not a PNG"""
+    with open(filepath, "rb") as f:
+        head = f.read(24)
+    if len(head) < 24 or head[:8] != b"\x89PNG\r\n\x1a\n" or head[12:16] != b"IHDR":
+        return None
+    return struct.unpack(">II", head[16:24])
+
+
+def _img_size_attrs(size: Optional[Tuple[int, int]]) -> str:
+    """width/height attributes for an <img>, so the browser reserves its box before decoding"""
+    return "" if size is None else f' width="{size[0]}" height="{size[1]}"'
+
+
+def _downsample(dates: List, values: List, max_points: int = CREDIT_TREND_MAX_POINTS) -> Tuple[List, List]:
+    """Evenly strided subset of a series, keeping its first and last points"""
+    if len(values) <= max_points:
+        return dates, values
+    picks = np.linspace(0, len(values) - 1, max_points).astype(int).tolist()
+    return [dates[i] for i in picks], [values[i] for i in picks]
+
+
+# matplotlib's page-wide "*{...}" stylesheet; _REPORT_CSS carries the same rule scoped to charts
+_SVG_STYLE = re.compile(r'<style type="text/css">.*?</style>', re.S)
+# Element ids and the references to them
+_SVG_ID_REFS = re.compile(r'(\bid="|url\(#|href="#)')
+
+
+def _render_svg(fig, id_prefix: str) -> str:
+    """A figure as an <svg> element ready to inline in HTML: text stays text, XML prolog and DOCTYPE dropped
+
+    Every chart names its elements figure_1, axes_1, ..., so ids are prefixed with `id_prefix`
+    to keep them unique when several charts share one page.
+    """
+    buf = io.StringIO()
+    with matplotlib.rc_context({"svg.fonttype": "none"}):
+        fig.savefig(buf, format="svg", bbox_inches="tight", metadata={"Date": None})
+    svg = buf.getvalue()
+    svg = _SVG_STYLE.sub("", svg[svg.index("<svg"):])
+    return _SVG_ID_REFS.sub(lambda m: f"{m.group(1)}{id_prefix}-", svg)
+
+
+def _mtime_ns(filepath: str) -> Optional[int]:
+    """Modification time of a file in nanoseconds, or None if it does not exist"""
+    try:
+        return os.stat(filepath).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def _read_json(filepath: Path) -> Dict:
+    """Parse a whole JSON file, with orjson when it is installed"""
+    if not ORJSON_AVAILABLE:
+        with open(filepath, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    with open(filepath, "rb") as f:
+        raw = f.read()
+    try:
+        return orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        # orjson is strict where json is not (NaN/Infinity, integers beyond 64 bits)
+        return json.loads(raw)
+
+
+def _read_credit_series(filepath: Path, keys: FrozenSet[str]) -> Dict:
+    """Stream credit_market_data.json with ijson, keeping only the requested series"""
+    with open(filepath, "rb") as f:
+        series = {key: value for key, value in ijson.kvitems(f, "credit_market", use_float=True) if key in keys}
+    return {"credit_market": series}
+
 
 class RiskDashboard:
     """Generates visualizations for risk assessment"""
 
-    def __init__(self, output_dir: Path = None):
+    _warning_template = _TEMPLATE_ENV.get_template("warning_dashboard.html.j2")
+
+    def __init__(self, output_dir: Path = None, cache_dir: Path = None):
         self.processed_dir = PROCESSED_DATA_DIR
+        self.market_dir = MARKET_DATA_DIR
         self.output_dir = output_dir or (PROCESSED_DATA_DIR.parent / "visualization" / "output")
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self._output_dir_str = os.fspath(self.output_dir)
+        # Bookkeeping that is not itself output (render fingerprints), kept out of output_dir;
+        # created on first write
+        self.cache_dir = cache_dir or (PROCESSED_DATA_DIR.parent / "visualization" / "cache")
+
+        # Parsed JSON inputs keyed by path (or a reader's cache key), with the (mtime_ns, size) they were read at
+        self._json_cache: Dict[object, Tuple[Tuple[int, int], Dict]] = {}
+
+        # Figure shared by the plot_* methods, created on first use (see _figure)
+        self._fig = None
+
+        # PNG resolution: multi-panel figures are 2-3x the area of single charts, so they get a
+        # lower DPI to keep file size and browser decode time in line
+        self.dpi_single = 150
+        self.dpi_multi = 100
+
+        # Indicator heatmap columns: order of first appearance in the assessment, or alphabetical
+        self.sort_indicators = False
+
+        # Whether plot_* methods also write the SVG copies the risk report inlines; only
+        # render_charts turns this on, for the charts generate_all draws for the report
+        self._inline_svg = False
+
+        # Also write warning_dashboard.html.gz, a precompressed copy for static file servers
+        self.write_gzip = False
 
         # Color scheme
         self.colors = {
@@ -39,95 +700,144 @@ class RiskDashboard:
             "secondary": "#6c757d",
             "background": "#f8f9fa",
             # Alert level colors
-            "GREEN": "#28a745",
-            "YELLOW": "#ffc107",
-            "ORANGE": "#fd7e14",
-            "RED": "#dc3545",
+            **ALERT_COLORS,
         }
 
-    def load_assessment(self) -> Optional[Dict]:
-        """Load risk assessment data"""
-        filepath = self.processed_dir / "risk_assessment.json"
-        if not filepath.exists():
-            print(f"Risk assessment not found: {filepath}")
-            return None
+    def _load_json(self, filepath: Path, missing_label: str = None,
+                   reader=_read_json, cache_key=None) -> Optional[Dict]:
+        """Load a JSON file, returning None if it does not exist
 
-        with open(filepath, "r", encoding="utf-8") as f:
-            return json.load(f)
-
-    def load_scenarios(self) -> Optional[Dict]:
-        """Load scenario projections"""
-        filepath = self.processed_dir / "scenario_projections.json"
-        if not filepath.exists():
+        Parsed files are memoized per instance and reused while the file's modification time and
+        size are unchanged, so a regenerated file is picked up without clearing anything. Callers
+        only read the returned data; it is shared between calls. A custom `reader` that keeps only
+        part of the file needs its own `cache_key`.
+        """
+        try:
+            stat = os.stat(filepath)
+        except FileNotFoundError:
+            if missing_label:
+                print(f"{missing_label} not found: {filepath}")
             return None
 
-        with open(filepath, "r", encoding="utf-8") as f:
-            return json.load(f)
+        key = filepath if cache_key is None else cache_key
+        version = (stat.st_mtime_ns, stat.st_size)
+        cached = self._json_cache.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
 
-    def load_warning_dashboard(self) -> Optional[Dict]:
-        """Load warning system dashboard data"""
-        filepath = self.processed_dir / "warning_dashboard.json"
-        if not filepath.exists():
-            return None
+        data = reader(filepath)
+        self._json_cache[key] = (version, data)
+        return data
 
-        with open(filepath, "r", encoding="utf-8") as f:
-            return json.load(f)
+    def load_credit_market(self, keys: Iterable[str] = None) -> Optional[Dict]:
+        """Load credit market data
 
-    def load_funding_health(self) -> Optional[Dict]:
-        """Load funding health report"""
-        filepath = self.processed_dir / "funding_health_report.json"
-        if not filepath.exists():
-            return None
+        Args:
+            keys: Series ids to keep under "credit_market"; all series when omitted. With ijson
+                installed only these series are deserialized, otherwise the file is loaded in
+                full and filtered.
+        """
+        filepath = self.market_dir / "credit_market_data.json"
+        if keys is None:
+            return self._load_json(filepath)
 
-        with open(filepath, "r", encoding="utf-8") as f:
-            return json.load(f)
+        keys = frozenset(keys)
+        if IJSON_AVAILABLE:
+            return self._load_json(filepath, reader=lambda path: _read_credit_series(path, keys),
+                                   cache_key=(filepath, keys))
 
-    def load_supply_demand(self) -> Optional[Dict]:
-        """Load supply-demand analysis"""
-        filepath = self.processed_dir / "supply_demand_analysis.json"
-        if not filepath.exists():
+        data = self._load_json(filepath)
+        if data is None:
             return None
+        series = data.get("credit_market", {})
+        return {**data, "credit_market": {key: value for key, value in series.items() if key in keys}}
 
-        with open(filepath, "r", encoding="utf-8") as f:
-            return json.load(f)
+    def _output_path(self, filename: str) -> str:
+        """Path of an output file as a plain string (os.path.join avoids building a Path per save)"""
+        return os.path.join(self._output_dir_str, filename)
+
+    def _available_charts(self, chart_files: List) -> List:
+        """Filter (filename, title) pairs down to the charts present in output_dir
 
-    def load_credit_market(self) -> Optional[Dict]:
-        """Load credit market data"""
-        filepath = MARKET_DATA_DIR / "credit_market_data.json"
-        if not filepath.exists():
+        Returns (filename, title, size) triples, where size is the image's pixel (width, height)
+        or None if it could not be read.
+        """
+        # One directory scan instead of a stat() per chart; scandir yields plain names
+        # without building a Path per entry
+        with os.scandir(self._output_dir_str) as entries:
+            existing = {entry.name for entry in entries}
+        return [(filename, title, _png_size(self._output_path(filename)))
+                for filename, title in chart_files if filename in existing]
+
+    def _svg_path(self, filename: str) -> Path:
+        """Where the inline SVG copy of a chart PNG is kept: under cache_dir, per output_dir"""
+        output_key = hashlib.blake2b(os.path.abspath(self._output_dir_str).encode("utf-8"),
+                                     digest_size=8).hexdigest()
+        return self.cache_dir / "svg" / output_key / _svg_name(filename)
+
+    def _save_inline_svg(self, fig, method: str):
+        """Write the SVG copy of a chart that generate_html_report inlines instead of its PNG
+
+        Only done while render_charts draws charts for the risk report; otherwise any older
+        copy is removed, so the report falls back to the freshly written PNG.
+        """
+        if not self._inline_svg:
+            self._discard_inline_svg(method)
+            return
+        filename = CHART_FILES[method]
+        svg_path = self._svg_path(filename)
+        svg_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(svg_path, "w", encoding="utf-8") as f:
+            f.write(_render_svg(fig, os.path.splitext(filename)[0]))
+
+    def _discard_inline_svg(self, method: str):
+        """Remove a chart's SVG copy, so the report falls back to its freshly written PNG"""
+        try:
+            os.remove(self._svg_path(CHART_FILES[method]))
+        except FileNotFoundError:
+            pass
+
+    def _read_inline_svg(self, filename: str) -> Optional[str]:
+        """The SVG copy of a chart PNG, or None if there is none"""
+        try:
+            with open(self._svg_path(filename), "r", encoding="utf-8") as f:
+                return f.read()
+        except FileNotFoundError:
             return None
 
-        with open(filepath, "r", encoding="utf-8") as f:
-            return json.load(f)
+    def _figure(self, figsize: Tuple[float, float]) -> "Figure":
+        """The dashboard's one Agg figure, cleared and resized for the next chart
 
-    def load_consolidated_data(self) -> Optional[Dict]:
-        """Load consolidated company data"""
-        filepath = self.processed_dir / "consolidated_data.json"
-        if not filepath.exists():
-            return None
+        Charts are drawn one after another, so a single Figure (and its canvas) is reused
+        instead of creating and closing a pyplot figure per chart.
+        """
+        if self._fig is None:
+            self._fig = Figure()
+        self._fig.clf()
+        self._fig.set_size_inches(figsize)
+        return self._fig
 
-        with open(filepath, "r", encoding="utf-8") as f:
-            return json.load(f)
+    def plot_company_risk_comparison(self, assessment: Dict, ranked_profiles: List[Dict] = None):
+        """Create bar chart comparing company risk scores
 
-    def plot_company_risk_comparison(self, assessment: Dict):
-        """Create bar chart comparing company risk scores"""
+        Args:
+            assessment: Risk assessment data
+            ranked_profiles: The assessment's company profiles already sorted by risk score,
+                highest first; sorted here when not given
+        """
         if not MATPLOTLIB_AVAILABLE:
             print("Skipping plot - matplotlib not available")
             return
 
-        companies = assessment.get("company_profiles", [])
-        if not companies:
+        companies_sorted = _rank_profiles(assessment) if ranked_profiles is None else ranked_profiles
+        if not companies_sorted:
             return
 
-        # Sort by risk score
-        companies_sorted = sorted(companies, key=lambda x: x["overall_risk_score"], reverse=True)
-
-        names = [c["company_name"] for c in companies_sorted]
-        scores = [c["overall_risk_score"] for c in companies_sorted]
-        levels = [c["risk_level"] for c in companies_sorted]
+        names, scores, levels = _columns(companies_sorted, _profile_bar, 3)
         colors = [self.colors.get(level, self.colors["secondary"]) for level in levels]
 
-        fig, ax = plt.subplots(figsize=(10, 6))
+        fig = self._figure((10, 6))
+        ax = fig.subplots()
         bars = ax.barh(names, scores, color=colors)
 
         # Add risk level labels
@@ -144,11 +854,11 @@ class RiskDashboard:
         ax.axvline(x=65, color=self.colors["HIGH"], linestyle='--', alpha=0.5, label='High threshold')
 
         ax.legend(loc='lower right')
-        plt.tight_layout()
+        fig.tight_layout()
 
-        output_path = self.output_dir / "company_risk_comparison.png"
-        plt.savefig(output_path, dpi=150, bbox_inches='tight')
-        plt.close()
+        output_path = self._output_path(CHART_FILES["plot_company_risk_comparison"])
+        fig.savefig(output_path, dpi=self.dpi_single, bbox_inches='tight')
+        self._save_inline_svg(fig, "plot_company_risk_comparison")
         print(f"Saved: {output_path}")
 
     def plot_risk_breakdown(self, assessment: Dict):
@@ -173,7 +883,8 @@ class RiskDashboard:
         ]
         colors = ['#ff6b6b', '#4dabf7', '#69db7c']
 
-        fig, ax = plt.subplots(figsize=(8, 8))
+        fig = self._figure((8, 8))
+        ax = fig.subplots()
         wedges, texts, autotexts = ax.pie(
             sizes, labels=labels, colors=colors,
             autopct='%1.1f%%', startangle=90,
@@ -188,11 +899,11 @@ class RiskDashboard:
         ax.text(0, 0, f'{overall:.0f}\n{level}',
                ha='center', va='center', fontsize=20, fontweight='bold')
 
-        plt.tight_layout()
+        fig.tight_layout()
 
-        output_path = self.output_dir / "risk_breakdown.png"
-        plt.savefig(output_path, dpi=150, bbox_inches='tight')
-        plt.close()
+        output_path = self._output_path(CHART_FILES["plot_risk_breakdown"])
+        fig.savefig(output_path, dpi=self.dpi_single, bbox_inches='tight')
+        self._save_inline_svg(fig, "plot_risk_breakdown")
         print(f"Saved: {output_path}")
 
     def plot_indicator_heatmap(self, assessment: Dict):
@@ -205,32 +916,32 @@ class RiskDashboard:
             return
 
         # Extract indicators
-        company_names = []
-        indicator_names = set()
-        indicator_data = {}
-
-        for company in companies:
-            name = company["company_name"]
-            company_names.append(name)
-            indicator_data[name] = {}
-
+        company_names = list(map(_get_company_name, companies))
+        # Columns in first-seen order (a dict is an insertion-ordered set); alphabetical on request
+        indicator_names = list(dict.fromkeys(indicator["name"] for company in companies
+                                             for indicator in company.get("indicators", [])))
+        if self.sort_indicators:
+            indicator_names.sort()
+        column_of = {name: j for j, name in enumerate(indicator_names)}
+
+        # Collect (row, column, score) triples in one pass, then fill the matrix with a single
+        # scatter; indicators a company does not report keep the neutral score of 50
+        rows, cols, scores = [], [], []
+        for i, company in enumerate(companies):
             for indicator in company.get("indicators", []):
-                ind_name = indicator["name"]
-                indicator_names.add(ind_name)
-                indicator_data[name][ind_name] = indicator["score"]
+                rows.append(i)
+                cols.append(column_of[indicator["name"]])
+                scores.append(indicator["score"])
+        matrix = np.full((len(company_names), len(indicator_names)), 50.0)
+        matrix[rows, cols] = scores
 
-        indicator_names = sorted(list(indicator_names))
-
-        # Create matrix
-        matrix = []
-        for company in company_names:
-            row = [indicator_data[company].get(ind, 50) for ind in indicator_names]
-            matrix.append(row)
-
-        fig, ax = plt.subplots(figsize=(12, 8))
+        fig = self._figure((12, 8))
+        ax = fig.subplots()
 
         # Create heatmap
         im = ax.imshow(matrix, cmap='RdYlGn_r', aspect='auto', vmin=0, vmax=100)
+        # Rasterize only the cell image; labels and annotations stay vector
+        im.set_rasterized(True)
 
         # Labels
         ax.set_xticks(range(len(indicator_names)))
@@ -242,19 +953,23 @@ class RiskDashboard:
         cbar = ax.figure.colorbar(im, ax=ax)
         cbar.ax.set_ylabel('Risk Score (0=Low, 100=High)', rotation=-90, va="bottom")
 
-        # Add values to cells
-        for i in range(len(company_names)):
-            for j in range(len(indicator_names)):
-                value = matrix[i][j]
-                color = 'white' if value > 50 else 'black'
-                ax.text(j, i, f'{value:.0f}', ha='center', va='center', color=color, fontsize=9)
+        # Add values to cells; past HEATMAP_MAX_LABELED_CELLS the text artists cost more than they
+        # tell, and the colorbar carries the scale
+        if matrix.size <= HEATMAP_MAX_LABELED_CELLS:
+            labels = np.char.mod('%.0f', matrix)
+            text_colors = np.where(matrix > 50, 'white', 'black')
+            for i, j in np.ndindex(matrix.shape):
+                ax.text(j, i, labels[i, j], ha='center', va='center', color=text_colors[i, j], fontsize=9)
 
         ax.set_title('Risk Indicator Heatmap by Company', fontsize=14)
-        plt.tight_layout()
+        fig.tight_layout()
 
-        output_path = self.output_dir / "indicator_heatmap.png"
-        plt.savefig(output_path, dpi=150, bbox_inches='tight')
-        plt.close()
+        output_path = self._output_path(CHART_FILES["plot_indicator_heatmap"])
+        fig.savefig(output_path, dpi=self.dpi_single, bbox_inches='tight')
+        if matrix.size <= HEATMAP_MAX_SVG_CELLS:
+            self._save_inline_svg(fig, "plot_indicator_heatmap")
+        else:
+            self._discard_inline_svg("plot_indicator_heatmap")
         print(f"Saved: {output_path}")
 
     def plot_scenario_projections(self, scenarios: Dict):
@@ -266,14 +981,27 @@ class RiskDashboard:
         if not scenario_list:
             return
 
-        fig, axes = plt.subplots(2, 2, figsize=(14, 10))
+        # Pull each scenario's projection columns out once; the three line subplots share them
+        risk_map = {"LOW": 1, "MEDIUM": 2, "HIGH": 3}
+        scenario_arrays = []
+        for scenario in scenario_list:
+            projections = scenario["projections"]
+            n = len(projections)
+            scenario_arrays.append({
+                "name": scenario["scenario_name"],
+                "years": np.fromiter((p["year"] for p in projections), dtype=np.int32, count=n),
+                "capex": np.fromiter((p["capex"] for p in projections), dtype=np.float64, count=n),
+                "ratio": np.fromiter((p["capex_to_cashflow_ratio"] for p in projections), dtype=np.float64, count=n),
+                "risk": np.fromiter((risk_map.get(p["risk_level"], 2) for p in projections), dtype=np.int8, count=n),
+            })
+
+        fig = self._figure((14, 10))
+        axes = fig.subplots(2, 2)
 
         # Plot 1: Capex over time
         ax1 = axes[0, 0]
-        for scenario in scenario_list:
-            years = [p["year"] for p in scenario["projections"]]
-            capex = [p["capex"] for p in scenario["projections"]]
-            ax1.plot(years, capex, marker='o', label=scenario["scenario_name"])
+        for arrays in scenario_arrays:
+            ax1.plot(arrays["years"], arrays["capex"], marker='o', label=arrays["name"])
         ax1.set_xlabel('Year')
         ax1.set_ylabel('Capex ($B)')
         ax1.set_title('Projected Capital Expenditure')
@@ -282,10 +1010,8 @@ class RiskDashboard:
 
         # Plot 2: Capex to Cashflow ratio
         ax2 = axes[0, 1]
-        for scenario in scenario_list:
-            years = [p["year"] for p in scenario["projections"]]
-            ratio = [p["capex_to_cashflow_ratio"] for p in scenario["projections"]]
-            ax2.plot(years, ratio, marker='o', label=scenario["scenario_name"])
+        for arrays in scenario_arrays:
+            ax2.plot(arrays["years"], arrays["ratio"], marker='o', label=arrays["name"])
         ax2.axhline(y=0.70, color='green', linestyle='--', alpha=0.5, label='Normal threshold')
         ax2.axhline(y=0.90, color='red', linestyle='--', alpha=0.5, label='Warning threshold')
         ax2.set_xlabel('Year')
@@ -314,12 +1040,8 @@ class RiskDashboard:
 
         # Plot 4: Risk level progression
         ax4 = axes[1, 1]
-        risk_map = {"LOW": 1, "MEDIUM": 2, "HIGH": 3}
-
-        for scenario in scenario_list:
-            years = [p["year"] for p in scenario["projections"]]
-            risks = [risk_map.get(p["risk_level"], 2) for p in scenario["projections"]]
-            ax4.plot(years, risks, marker='s', label=scenario["scenario_name"], linewidth=2)
+        for arrays in scenario_arrays:
+            ax4.plot(arrays["years"], arrays["risk"], marker='s', label=arrays["name"], linewidth=2)
 
         ax4.set_yticks([1, 2, 3])
         ax4.set_yticklabels(['LOW', 'MEDIUM', 'HIGH'])
@@ -329,73 +1051,55 @@ class RiskDashboard:
         ax4.legend()
         ax4.grid(True, alpha=0.3)
 
-        # Color bands for risk levels
-        ax4.axhspan(0.5, 1.5, color=self.colors["LOW"], alpha=0.1)
-        ax4.axhspan(1.5, 2.5, color=self.colors["MEDIUM"], alpha=0.1)
-        ax4.axhspan(2.5, 3.5, color=self.colors["HIGH"], alpha=0.1)
+        # Color bands for risk levels, as one collection spanning the axes width (x in axes
+        # coordinates, y in data) rather than a separate axhspan patch per band
+        bands = PolyCollection(
+            [[(0, y - 0.5), (1, y - 0.5), (1, y + 0.5), (0, y + 0.5)] for y in (1, 2, 3)],
+            facecolors=[self.colors["LOW"], self.colors["MEDIUM"], self.colors["HIGH"]],
+            edgecolors='none', alpha=0.1, transform=ax4.get_yaxis_transform(),
+        )
+        ax4.add_collection(bands, autolim=False)
+        ax4.update_datalim([(0, 0.5), (0, 3.5)], updatex=False)
+        ax4.autoscale_view()
 
-        plt.tight_layout()
+        fig.tight_layout()
 
-        output_path = self.output_dir / "scenario_projections.png"
-        plt.savefig(output_path, dpi=150, bbox_inches='tight')
-        plt.close()
+        output_path = self._output_path(CHART_FILES["plot_scenario_projections"])
+        fig.savefig(output_path, dpi=self.dpi_multi, bbox_inches='tight')
+        self._save_inline_svg(fig, "plot_scenario_projections")
         print(f"Saved: {output_path}")
 
-    def generate_html_report(self, assessment: Dict, scenarios: Dict = None) -> str:
-        """Generate HTML report with embedded charts"""
-        html_parts = []
+    def generate_html_report(self, assessment: Dict, scenarios: Dict = None,
+                             ranked_profiles: List[Dict] = None) -> str:
+        """Generate HTML report with embedded charts
 
-        # Header
-        html_parts.append("""
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>AI Funding Risk Assessment Report</title>
-    <style>
-        body { font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-               margin: 0; padding: 20px; background: #f5f5f5; }
-        .container { max-width: 1200px; margin: 0 auto; background: white;
-                    padding: 30px; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }
-        h1 { color: #1a1a1a; border-bottom: 2px solid #007bff; padding-bottom: 10px; }
-        h2 { color: #333; margin-top: 30px; }
-        .risk-badge { display: inline-block; padding: 5px 15px; border-radius: 20px;
-                     font-weight: bold; color: white; }
-        .risk-LOW { background: #28a745; }
-        .risk-MEDIUM { background: #ffc107; color: #1a1a1a; }
-        .risk-HIGH { background: #dc3545; }
-        .score-box { background: #f8f9fa; padding: 20px; border-radius: 8px;
-                    margin: 20px 0; text-align: center; }
-        .score-value { font-size: 48px; font-weight: bold; color: #1a1a1a; }
-        .score-label { font-size: 14px; color: #666; }
-        .grid { display: grid; grid-template-columns: repeat(auto-fit, minmax(250px, 1fr)); gap: 20px; }
-        .card { background: #f8f9fa; padding: 15px; border-radius: 8px; }
-        .card h3 { margin-top: 0; color: #333; font-size: 16px; }
-        table { width: 100%; border-collapse: collapse; margin: 20px 0; }
-        th, td { padding: 12px; text-align: left; border-bottom: 1px solid #ddd; }
-        th { background: #f8f9fa; font-weight: 600; }
-        .finding { padding: 10px; margin: 5px 0; background: #fff3cd;
-                  border-left: 4px solid #ffc107; border-radius: 4px; }
-        .recommendation { padding: 10px; margin: 5px 0; background: #d4edda;
-                         border-left: 4px solid #28a745; border-radius: 4px; }
-        .chart-container { margin: 20px 0; text-align: center; }
-        .chart-container img { max-width: 100%; height: auto; border-radius: 8px;
-                              box-shadow: 0 2px 4px rgba(0,0,0,0.1); }
-        .footer { margin-top: 40px; padding-top: 20px; border-top: 1px solid #ddd;
-                 color: #666; font-size: 12px; }
-    </style>
-</head>
-<body>
-    <div class="container">
-""")
+        Args:
+            assessment: Risk assessment data
+            scenarios: Scenario projections (unused by the page itself)
+            ranked_profiles: The assessment's company profiles already sorted by risk score,
+                highest first; sorted here when not given
 
+        Returns:
+            Path of the written report
+        """
         # Title and date
-        date_str = assessment.get("assessment_date", datetime.now().isoformat())[:10]
+        date_str = assessment.get("assessment_date") or _timestamp("%Y-%m-%d")
+        date_str = date_str[:10]
         overall_score = assessment.get("overall_risk_score", 0)
         risk_level = assessment.get("risk_level", "MEDIUM")
 
-        html_parts.append(f"""
+        # Check for chart images
+        chart_files = [
+            ("company_risk_comparison.png", "Company Risk Comparison"),
+            ("risk_breakdown.png", "Risk Category Breakdown"),
+            ("indicator_heatmap.png", "Indicator Heatmap"),
+            ("scenario_projections.png", "Scenario Projections"),
+        ]
+
+        def _emit():
+            yield _REPORT_HEADER_BYTES
+
+            yield f"""
         <h1>AI Funding Risk Assessment Report</h1>
         <p>Generated: {date_str}</p>
 
@@ -424,99 +1128,54 @@ class RiskDashboard:
                 <div style="color: #666; font-size: 12px;">Return on investment</div>
             </div>
         </div>
-""")
+"""
 
-        # Company profiles table
-        html_parts.append("""
-        <h2>Company Risk Profiles</h2>
-        <table>
-            <thead>
-                <tr>
-                    <th>Company</th>
-                    <th>Ticker</th>
-                    <th>Risk Score</th>
-                    <th>Risk Level</th>
-                    <th>Summary</th>
-                </tr>
-            </thead>
-            <tbody>
-""")
+            # Company profiles table
+            yield _REPORT_PROFILES_HEAD_BYTES
 
-        for company in sorted(assessment.get("company_profiles", []),
-                             key=lambda x: x["overall_risk_score"], reverse=True):
-            html_parts.append(f"""
-                <tr>
-                    <td>{company['company_name']}</td>
-                    <td>{company['ticker']}</td>
-                    <td>{company['overall_risk_score']:.0f}</td>
-                    <td><span class="risk-badge risk-{company['risk_level']}">{company['risk_level']}</span></td>
-                    <td>{company['summary']}</td>
-                </tr>
-""")
+            # Each repeated section goes out as one joined chunk
+            companies = _rank_profiles(assessment) if ranked_profiles is None else ranked_profiles
+            yield "".join(map(_REPORT_COMPANY_ROW, companies))
 
-        html_parts.append("""
-            </tbody>
-        </table>
-""")
+            yield _REPORT_PROFILES_FOOT_BYTES
 
-        # Key findings
-        html_parts.append("""
+            # Key findings
+            yield """
         <h2>Key Findings</h2>
-""")
-        for finding in assessment.get("key_findings", []):
-            html_parts.append(f'        <div class="finding">{finding}</div>\n')
+"""
+            yield "".join(map(_REPORT_FINDING, assessment.get("key_findings", [])))
 
-        # Recommendations
-        html_parts.append("""
+            # Recommendations
+            yield """
         <h2>Recommendations</h2>
-""")
-        for rec in assessment.get("recommendations", []):
-            html_parts.append(f'        <div class="recommendation">{rec}</div>\n')
+"""
+            yield "".join(map(_REPORT_RECOMMENDATION, assessment.get("recommendations", [])))
 
-        # Charts section
-        html_parts.append("""
+            # Charts section
+            yield """
         <h2>Visualizations</h2>
-""")
-
-        # Check for chart images
-        chart_files = [
-            ("company_risk_comparison.png", "Company Risk Comparison"),
-            ("risk_breakdown.png", "Risk Category Breakdown"),
-            ("indicator_heatmap.png", "Indicator Heatmap"),
-            ("scenario_projections.png", "Scenario Projections"),
-        ]
-
-        for filename, title in chart_files:
-            chart_path = self.output_dir / filename
-            if chart_path.exists():
-                html_parts.append(f"""
-        <div class="chart-container">
-            <h3>{title}</h3>
-            <img src="{filename}" alt="{title}">
-        </div>
-""")
-
-        # Footer
-        html_parts.append("""
-        <div class="footer">
-            <p>This report is generated automatically based on publicly available financial data.
-            It is intended for informational purposes only and should not be considered financial advice.</p>
-            <p>Data sources: SEC EDGAR, FRED, Yahoo Finance</p>
-        </div>
-    </div>
-</body>
-</html>
-""")
-
-        html_content = "".join(html_parts)
-
-        # Save HTML report
-        output_path = self.output_dir / "risk_report.html"
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write(html_content)
+"""
+            # Charts with an SVG copy are inlined as vector graphics; the rest link their PNG
+            blocks = []
+            for filename, title, size in self._available_charts(chart_files):
+                svg = self._read_inline_svg(filename)
+                if svg is None:
+                    blocks.append(_REPORT_CHART(filename, title, _img_size_attrs(size)))
+                else:
+                    blocks.append(_REPORT_CHART_SVG(title, svg))
+            yield "".join(blocks)
+
+            yield _REPORT_FOOTER_BYTES
+
+        # Stream chunks straight into the file buffer instead of joining them first
+        output_path = self._output_path("risk_report.html")
+        with open(output_path, "wb", buffering=HTML_WRITE_BUFFER) as f:
+            for chunk in _emit():
+                # Static parts arrive pre-encoded; only the data-dependent chunks need encoding
+                f.write(chunk if isinstance(chunk, bytes) else chunk.encode("utf-8"))
 
         print(f"Saved: {output_path}")
-        return html_content
+        return output_path
 
     def plot_warning_signals(self, warning_data: Dict):
         """Plot warning signal status overview"""
@@ -534,9 +1193,6 @@ class RiskDashboard:
             if cat in categories:
                 categories[cat].append(signal)
 
-        # Create subplot for each category
-        fig, axes = plt.subplots(1, 3, figsize=(15, 5))
-
         level_colors = {
             "GREEN": self.colors["GREEN"],
             "YELLOW": self.colors["YELLOW"],
@@ -544,32 +1200,58 @@ class RiskDashboard:
             "RED": self.colors["RED"],
         }
 
-        for ax, (category, cat_signals) in zip(axes, categories.items()):
+        # One row per signal, grouped by category, top to bottom. Signals without a numeric
+        # reading keep their row, with an empty bar and an "n/a" marker
+        labels, values, colors, thresholds, separators, unavailable = [], [], [], [], [], []
+        for category, cat_signals in categories.items():
             if not cat_signals:
-                ax.text(0.5, 0.5, "No signals", ha='center', va='center', fontsize=12)
-                ax.set_title(f'{category.upper()} Signals')
-                ax.axis('off')
                 continue
+            if labels:
+                separators.append(len(labels) - 0.5)
+            for s in cat_signals:
+                value = s.get("current_value")
+                threshold = s.get("threshold")
+                if threshold and isinstance(threshold, (int, float)):
+                    thresholds.append((len(labels), threshold))
+                if not isinstance(value, (int, float)):
+                    unavailable.append(len(labels))
+                    value = 0
+                labels.append(f'{category.upper()} / {s["signal_name"][:20]}')
+                values.append(value)
+                colors.append(level_colors.get(s["alert_level"], self.colors["secondary"]))
+
+        fig = self._figure((12, max(3.0, 0.5 * len(labels) + 1.5)))
+        ax = fig.subplots()
+
+        if labels:
+            # One bar per signal on a shared axis
+            ax.barh(np.arange(len(labels)), values, color=colors)
+            ax.set_yticks(np.arange(len(labels)))
+            ax.set_yticklabels(labels)
+            ax.invert_yaxis()
+
+            # Each threshold marks its own bar's row, all in one collection
+            if thresholds:
+                rows, limits = zip(*thresholds)
+                rows = np.asarray(rows)
+                ax.vlines(limits, rows - 0.4, rows + 0.4, colors='red', linestyles='--', alpha=0.5)
+
+            for y in unavailable:
+                ax.text(0, y, ' n/a', va='center', ha='left', color=colors[y], fontweight='bold')
+
+            for y in separators:
+                ax.axhline(y, color='gray', linewidth=0.8, alpha=0.5)
 
-            names = [s["signal_name"][:20] for s in cat_signals]
-            values = [s["current_value"] for s in cat_signals]
-            colors = [level_colors.get(s["alert_level"], self.colors["secondary"]) for s in cat_signals]
-
-            bars = ax.barh(names, values, color=colors)
-
-            # Add threshold lines if available
-            for i, signal in enumerate(cat_signals):
-                if signal.get("threshold"):
-                    ax.axvline(x=signal["threshold"], color='red', linestyle='--', alpha=0.5)
-
-            ax.set_title(f'{category.upper()} Signals')
             ax.set_xlabel('Value')
+        else:
+            ax.text(0.5, 0.5, "No signals", ha='center', va='center', fontsize=12)
+            ax.axis('off')
 
-        plt.tight_layout()
+        ax.set_title('Warning Signals by Category')
+        fig.tight_layout()
 
-        output_path = self.output_dir / "warning_signals.png"
-        plt.savefig(output_path, dpi=150, bbox_inches='tight')
-        plt.close()
+        output_path = self._output_path(CHART_FILES["plot_warning_signals"])
+        fig.savefig(output_path, dpi=self.dpi_single, bbox_inches='tight')
         print(f"Saved: {output_path}")
 
     def plot_supply_demand_projection(self, supply_demand: Dict):
@@ -583,17 +1265,11 @@ class RiskDashboard:
             return
 
         # Combine historical and projection data
-        hist_years = [h["year"] for h in historical]
-        hist_demand = [h["demand_B"] for h in historical]
-        hist_supply = [h["supply_B"] for h in historical]
-        hist_gap = [h["gap_B"] for h in historical]
+        hist_years, hist_demand, hist_supply, hist_gap = _columns(historical, _balance_point, 4)
+        proj_years, proj_demand, proj_supply, proj_gap = _columns(projections, _balance_point, 4)
 
-        proj_years = [p["year"] for p in projections]
-        proj_demand = [p["demand_B"] for p in projections]
-        proj_supply = [p["supply_B"] for p in projections]
-        proj_gap = [p["gap_B"] for p in projections]
-
-        fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(14, 10))
+        fig = self._figure((14, 10))
+        ax1, ax2 = fig.subplots(2, 1)
 
         # Plot 1: Supply vs Demand
         # Historical data (solid lines with markers)
@@ -612,8 +1288,9 @@ class RiskDashboard:
             ax1.text(boundary, ax1.get_ylim()[1] * 0.95, '  Projected →', fontsize=10, color='gray', va='top')
 
         # Fill between for projection
-        ax1.fill_between(proj_years, proj_demand, proj_supply, alpha=0.2,
-                         color='green' if proj_supply[-1] > proj_demand[-1] else 'red')
+        gap_fill = ax1.fill_between(proj_years, proj_demand, proj_supply, alpha=0.2,
+                                    color='green' if proj_supply[-1] > proj_demand[-1] else 'red')
+        gap_fill.set_rasterized(True)
 
         ax1.set_xlabel('Year', fontsize=12)
         ax1.set_ylabel('Amount ($B)', fontsize=12)
@@ -663,11 +1340,10 @@ class RiskDashboard:
         ]
         ax2.legend(handles=legend_elements, loc='upper left', fontsize=10)
 
-        plt.tight_layout()
+        fig.tight_layout()
 
-        output_path = self.output_dir / "supply_demand_projection.png"
-        plt.savefig(output_path, dpi=150, bbox_inches='tight')
-        plt.close()
+        output_path = self._output_path(CHART_FILES["plot_supply_demand_projection"])
+        fig.savefig(output_path, dpi=self.dpi_multi, bbox_inches='tight')
         print(f"Saved: {output_path}")
 
     def plot_funding_health_gauge(self, funding_health: Dict):
@@ -679,36 +1355,31 @@ class RiskDashboard:
         score = overall.get("overall_score", 50)
         health_status = overall.get("health_status", "neutral")
 
-        fig, ax = plt.subplots(figsize=(8, 6), subplot_kw={'projection': 'polar'})
+        fig = self._figure((8, 6))
+        ax = fig.subplots(subplot_kw={'projection': 'polar'})
 
         # Create gauge
-        theta = score / 100 * 3.14159  # Convert to radians (half circle)
-
-        # Background arc
-        theta_bg = [i / 100 * 3.14159 for i in range(101)]
-        r_bg = [1] * 101
-        ax.plot(theta_bg, r_bg, color='lightgray', linewidth=30, solid_capstyle='round')
-
-        # Colored arc based on score
-        if score >= 70:
-            color = self.colors["GREEN"]
-        elif score >= 50:
-            color = self.colors["YELLOW"]
-        else:
-            color = self.colors["RED"]
+        theta = score / 100 * np.pi  # Convert to radians (half circle)
+
+        # Background arc: one point per score unit over the half circle
+        theta_bg = np.linspace(0, np.pi, 101)
+        ax.plot(theta_bg, np.ones_like(theta_bg), color='lightgray', linewidth=30, solid_capstyle='round')
 
-        theta_fg = [i / 100 * 3.14159 for i in range(int(score) + 1)]
-        r_fg = [1] * (int(score) + 1)
-        ax.plot(theta_fg, r_fg, color=color, linewidth=30, solid_capstyle='round')
+        # Colored arc based on score, the same points up to the whole-number score
+        color = _score_color(score)
+
+        n_fg = max(int(score) + 1, 0)
+        theta_fg = theta_bg[:n_fg]
+        ax.plot(theta_fg, np.ones_like(theta_fg), color=color, linewidth=30, solid_capstyle='round')
 
         # Add needle
         ax.annotate('', xy=(theta, 0.7), xytext=(0, 0),
                    arrowprops=dict(arrowstyle='->', color='black', lw=2))
 
         # Add score text
-        ax.text(3.14159/2, 0.3, f'{score:.0f}', ha='center', va='center',
+        ax.text(np.pi / 2, 0.3, f'{score:.0f}', ha='center', va='center',
                fontsize=36, fontweight='bold')
-        ax.text(3.14159/2, 0.1, health_status.upper(), ha='center', va='center',
+        ax.text(np.pi / 2, 0.1, health_status.upper(), ha='center', va='center',
                fontsize=14, color=color)
 
         # Configure axes
@@ -719,12 +1390,11 @@ class RiskDashboard:
         ax.set_yticks([])
         ax.spines['polar'].set_visible(False)
 
-        plt.title('Funding Environment Health Score', fontsize=14, pad=20)
-        plt.tight_layout()
+        ax.set_title('Funding Environment Health Score', fontsize=14, pad=20)
+        fig.tight_layout()
 
-        output_path = self.output_dir / "funding_health_gauge.png"
-        plt.savefig(output_path, dpi=150, bbox_inches='tight')
-        plt.close()
+        output_path = self._output_path(CHART_FILES["plot_funding_health_gauge"])
+        fig.savefig(output_path, dpi=self.dpi_single, bbox_inches='tight')
         print(f"Saved: {output_path}")
 
     def plot_credit_market_trends(self, credit_data: Dict):
@@ -737,14 +1407,14 @@ class RiskDashboard:
             return
 
         # Select key indicators to plot
-        key_series = ["BAMLH0A0HYM2", "BAMLC0A0CM", "T10Y2Y", "DFF"]
-        available_series = [s for s in key_series if s in credit_market]
+        available_series = [s for s in CREDIT_TREND_SERIES if s in credit_market]
 
         if not available_series:
             return
 
         n_series = len(available_series)
-        fig, axes = plt.subplots(n_series, 1, figsize=(12, 3 * n_series))
+        fig = self._figure((12, 3 * n_series))
+        axes = fig.subplots(n_series, 1)
         if n_series == 1:
             axes = [axes]
 
@@ -755,8 +1425,7 @@ class RiskDashboard:
             if not observations:
                 continue
 
-            dates = [obs["date"] for obs in observations]
-            values = [obs["value"] for obs in observations]
+            dates, values = _downsample(*_columns(observations, _observation, 2))
 
             ax.plot(dates, values, 'b-', linewidth=1.5)
             ax.fill_between(dates, values, alpha=0.3)
@@ -772,306 +1441,64 @@ class RiskDashboard:
             ax.set_title(f'{description} (Latest: {latest.get("value", "N/A"):.3f})')
             ax.grid(True, alpha=0.3)
 
-        plt.tight_layout()
+        fig.tight_layout()
 
-        output_path = self.output_dir / "credit_market_trends.png"
-        plt.savefig(output_path, dpi=150, bbox_inches='tight')
-        plt.close()
+        output_path = self._output_path(CHART_FILES["plot_credit_market_trends"])
+        fig.savefig(output_path, dpi=self.dpi_multi, bbox_inches='tight')
         print(f"Saved: {output_path}")
 
-    def generate_warning_html_report(self, warning_data: Dict, funding_health: Dict = None,
-                                     supply_demand: Dict = None) -> str:
-        """Generate HTML report for warning system"""
-        html_parts = []
-
-        # Header with warning-specific styles
-        html_parts.append("""
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>AI Funding Risk Early Warning Dashboard</title>
-    <style>
-        body { font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-               margin: 0; padding: 20px; background: #1a1a2e; color: #eee; }
-        .container { max-width: 1400px; margin: 0 auto; }
-        h1 { color: #fff; border-bottom: 2px solid #4dabf7; padding-bottom: 10px; }
-        h2 { color: #4dabf7; margin-top: 30px; }
-        .alert-panel { padding: 20px; border-radius: 12px; margin: 20px 0;
-                      display: flex; align-items: center; gap: 20px; }
-        .alert-GREEN { background: linear-gradient(135deg, #28a745, #20c997); }
-        .alert-YELLOW { background: linear-gradient(135deg, #ffc107, #fd7e14); color: #1a1a1a; }
-        .alert-ORANGE { background: linear-gradient(135deg, #fd7e14, #dc3545); }
-        .alert-RED { background: linear-gradient(135deg, #dc3545, #c92a2a); }
-        .alert-icon { font-size: 48px; }
-        .alert-content { flex: 1; }
-        .alert-level { font-size: 24px; font-weight: bold; }
-        .alert-description { opacity: 0.9; margin-top: 5px; }
-        .score-display { font-size: 36px; font-weight: bold; }
-        .grid { display: grid; grid-template-columns: repeat(auto-fit, minmax(300px, 1fr)); gap: 20px; }
-        .card { background: #16213e; padding: 20px; border-radius: 12px;
-               border: 1px solid #0f3460; }
-        .card h3 { margin-top: 0; color: #4dabf7; font-size: 16px; }
-        .metric { display: flex; justify-content: space-between; padding: 8px 0;
-                 border-bottom: 1px solid #0f3460; }
-        .metric-name { color: #aaa; }
-        .metric-value { font-weight: bold; }
-        .signal-list { margin: 0; padding: 0; list-style: none; }
-        .signal-item { padding: 10px; margin: 5px 0; border-radius: 8px;
-                      background: #0f3460; display: flex; justify-content: space-between;
-                      align-items: center; }
-        .signal-badge { padding: 4px 12px; border-radius: 20px; font-size: 12px;
-                       font-weight: bold; }
-        .badge-GREEN { background: #28a745; }
-        .badge-YELLOW { background: #ffc107; color: #1a1a1a; }
-        .badge-ORANGE { background: #fd7e14; }
-        .badge-RED { background: #dc3545; }
-        table { width: 100%; border-collapse: collapse; margin: 20px 0; }
-        th, td { padding: 12px; text-align: left; border-bottom: 1px solid #0f3460; }
-        th { background: #0f3460; color: #4dabf7; font-weight: 600; }
-        tr:hover { background: #1f4068; }
-        .positive { color: #28a745; }
-        .negative { color: #dc3545; }
-        .chart-container { margin: 20px 0; background: #16213e; padding: 20px;
-                          border-radius: 12px; }
-        .chart-container img { max-width: 100%; height: auto; border-radius: 8px; }
-        .recommendation { padding: 12px; margin: 8px 0; background: #1f4068;
-                         border-left: 4px solid #4dabf7; border-radius: 4px; }
-        .footer { margin-top: 40px; padding-top: 20px; border-top: 1px solid #0f3460;
-                 color: #666; font-size: 12px; text-align: center; }
-        .status-row { display: flex; gap: 10px; flex-wrap: wrap; margin: 15px 0; }
-        .status-item { background: #0f3460; padding: 8px 16px; border-radius: 8px;
-                      display: flex; align-items: center; gap: 8px; }
-        .status-dot { width: 10px; height: 10px; border-radius: 50%; }
-    </style>
-</head>
-<body>
-    <div class="container">
-""")
-
+    def _warning_context(self, warning_data: Dict, funding_health: Optional[Dict],
+                         supply_demand: Optional[Dict], charts: List) -> Dict:
+        """Template variables for the warning dashboard"""
         # Alert level and score
         alert_level = warning_data.get("overall_status", "GREEN")
         # Use overall_score (the actual field name in warning_dashboard.json)
         composite_score = warning_data.get("overall_score", 0)
-        level_info = ALERT_LEVELS.get(alert_level, {})
-
-        alert_icons = {"GREEN": "✓", "YELLOW": "⚠", "ORANGE": "⚡", "RED": "🚨"}
-
-        html_parts.append(f"""
-        <h1>AI Funding Risk Early Warning Dashboard</h1>
-        <p style="color: #aaa;">Generated: {warning_data.get('timestamp', datetime.now().isoformat())[:19]}</p>
-
-        <div class="alert-panel alert-{alert_level}">
-            <div class="alert-icon">{alert_icons.get(alert_level, '●')}</div>
-            <div class="alert-content">
-                <div class="alert-level">{level_info.get('label', alert_level)} - Alert Level</div>
-                <div class="alert-description">{level_info.get('description', '')}</div>
-            </div>
-            <div class="score-display">{composite_score:.0f}/100</div>
-        </div>
-""")
-
-        # Key metrics grid
-        html_parts.append("""
-        <div class="grid">
-""")
-
-        # Signal summary by category (from signals_summary.by_category)
-        signals_summary = warning_data.get("signals_summary", {})
-        by_category = signals_summary.get("by_category", {})
-        by_severity = signals_summary.get("by_severity", {})
-
-        # Show overall health score card
-        health_score_color = "#28a745" if composite_score >= 70 else ("#ffc107" if composite_score >= 50 else "#dc3545")
-        html_parts.append(f"""
-            <div class="card">
-                <h3>OVERALL HEALTH</h3>
-                <div style="font-size: 36px; font-weight: bold; color: {health_score_color};">{composite_score:.0f}</div>
-                <div style="color: #aaa; font-size: 12px;">Health Score (0-100)</div>
-            </div>
-""")
-
-        # Show signal counts by severity
-        red_count = by_severity.get("RED", 0)
-        orange_count = by_severity.get("ORANGE", 0)
-        yellow_count = by_severity.get("YELLOW", 0)
-        green_count = by_severity.get("GREEN", 0)
-
-        html_parts.append(f"""
-            <div class="card">
-                <h3>SIGNAL STATUS</h3>
-                <div style="display: flex; gap: 10px; justify-content: center; margin: 10px 0;">
-                    <span style="color: #dc3545;">RED: {red_count}</span>
-                    <span style="color: #fd7e14;">ORANGE: {orange_count}</span>
-                    <span style="color: #ffc107;">YELLOW: {yellow_count}</span>
-                    <span style="color: #28a745;">GREEN: {green_count}</span>
-                </div>
-                <div style="color: #aaa; font-size: 12px;">Warning Signals by Severity</div>
-            </div>
-""")
-
-        # Add funding health if available
-        if funding_health:
-            overall = funding_health.get("overall_assessment", {})
-            health_score = overall.get("overall_score", 50)
-            health_status = overall.get("health_status", "neutral")
-            status_color = "#28a745" if health_score >= 70 else ("#ffc107" if health_score >= 50 else "#dc3545")
-            html_parts.append(f"""
-            <div class="card">
-                <h3>FUNDING HEALTH</h3>
-                <div style="font-size: 36px; font-weight: bold; color: {status_color};">{health_score:.0f}</div>
-                <div style="color: #aaa; font-size: 12px;">{health_status.upper()}</div>
-            </div>
-""")
-
-        # Add supply-demand balance if available
-        if supply_demand:
-            balance = supply_demand.get("balance_analysis", {})
-            balance_ratio = balance.get("balance_ratio", 1.0)
-            gap = balance.get("gap_annual_B", 0)
-            status_color = "#28a745" if balance_ratio >= 1.0 else "#dc3545"
-            html_parts.append(f"""
-            <div class="card">
-                <h3>SUPPLY/DEMAND BALANCE</h3>
-                <div style="font-size: 36px; font-weight: bold; color: {status_color};">{balance_ratio:.2f}x</div>
-                <div style="color: #aaa; font-size: 12px;">Annual Gap: ${gap:+.0f}B</div>
-            </div>
-""")
-
-        html_parts.append("""
-        </div>
-""")
+        health_score_color = _score_color(composite_score)
 
         # Active signals section
         signals = warning_data.get("active_signals", [])
-        elevated_signals = [s for s in signals if s.get("alert_level") not in ["GREEN"]]
-
-        if elevated_signals:
-            html_parts.append("""
-        <h2>Elevated Warning Signals</h2>
-        <table>
-            <thead>
-                <tr>
-                    <th>Signal</th>
-                    <th>Category</th>
-                    <th>Current Value</th>
-                    <th>Threshold</th>
-                    <th>Alert Level</th>
-                </tr>
-            </thead>
-            <tbody>
-""")
-            for signal in sorted(elevated_signals, key=lambda x: {"RED": 0, "ORANGE": 1, "YELLOW": 2}.get(x.get("alert_level"), 3)):
-                html_parts.append(f"""
-                <tr>
-                    <td>{signal.get('signal_name', 'Unknown')}</td>
-                    <td>{signal.get('category', 'N/A').upper()}</td>
-                    <td>{signal.get('current_value', 'N/A'):.2f if isinstance(signal.get('current_value'), (int, float)) else signal.get('current_value', 'N/A')}</td>
-                    <td>{signal.get('threshold', 'N/A'):.2f if isinstance(signal.get('threshold'), (int, float)) else signal.get('threshold', 'N/A')}</td>
-                    <td><span class="signal-badge badge-{signal.get('alert_level', 'GREEN')}">{signal.get('alert_level', 'GREEN')}</span></td>
-                </tr>
-""")
-            html_parts.append("""
-            </tbody>
-        </table>
-""")
-
-        # Supply-Demand Projections (with historical data)
-        if supply_demand:
-            historical = supply_demand.get("historical", [])
-            projections = supply_demand.get("projections", [])
-
-            if historical or projections:
-                html_parts.append("""
-        <h2>Supply-Demand Historical & Projection</h2>
-        <p style="color: #aaa; font-size: 0.9em; margin-bottom: 10px;">
-            <em>Historical data shows actual YoY growth rates. Projected data uses modeled growth rates.</em>
-        </p>
-        <table>
-            <thead>
-                <tr>
-                    <th>Year</th>
-                    <th>Demand ($B)</th>
-                    <th>Supply ($B)</th>
-                    <th>Gap ($B)</th>
-                    <th>Status</th>
-                    <th>Risk Level</th>
-                </tr>
-            </thead>
-            <tbody>
-""")
-                # Helper function to format value with growth rate
-                def format_with_growth(value, growth_pct, is_historical):
-                    if growth_pct is not None:
-                        growth_str = f"+{growth_pct:.1f}%" if growth_pct >= 0 else f"{growth_pct:.1f}%"
-                        label = "actual" if is_historical else "proj"
-                        # Use cyan color for historical, gray for projected
-                        color = "#4dabf7" if is_historical else "#888"
-                        return f"${value:.0f} <span style='color:{color};font-size:0.85em;'>({growth_str} {label})</span>"
-                    return f"${value:.0f}"
-
-                # Display historical data first
-                for hist in historical:
-                    gap_class = "positive" if hist.get("gap_B", 0) > 0 else "negative"
-                    demand_str = format_with_growth(hist.get('demand_B', 0), hist.get('demand_growth_pct'), True)
-                    supply_str = format_with_growth(hist.get('supply_B', 0), hist.get('supply_growth_pct'), True)
-                    html_parts.append(f"""
-                <tr style="background-color: #1a3a5c;">
-                    <td><strong>{hist.get('year', 'N/A')}</strong> <span style="color:#4dabf7;font-size:0.8em;">(Historical)</span></td>
-                    <td>{demand_str}</td>
-                    <td>{supply_str}</td>
-                    <td class="{gap_class}">${hist.get('gap_B', 0):+.0f}</td>
-                    <td>{hist.get('status', 'N/A').upper()}</td>
-                    <td><span class="signal-badge badge-{'GREEN' if hist.get('risk_level') == 'LOW' else ('YELLOW' if hist.get('risk_level') == 'MEDIUM' else 'RED')}">{hist.get('risk_level', 'N/A')}</span></td>
-                </tr>
-""")
-
-                # Add separator row between historical and projected
-                if historical and projections:
-                    html_parts.append("""
-                <tr style="background-color: #0f3460; border-top: 2px solid #4dabf7;">
-                    <td colspan="6" style="text-align: center; font-weight: bold; color: #4dabf7; padding: 8px;">
-                        ▼ Projected Data ▼
-                    </td>
-                </tr>
-""")
-
-                # Display projected data
-                for proj in projections:
-                    gap_class = "positive" if proj.get("gap_B", 0) > 0 else "negative"
-                    demand_str = format_with_growth(proj.get('demand_B', 0), proj.get('demand_growth_pct'), False)
-                    supply_str = format_with_growth(proj.get('supply_B', 0), proj.get('supply_growth_pct'), False)
-                    html_parts.append(f"""
-                <tr>
-                    <td>{proj.get('year', 'N/A')}</td>
-                    <td>{demand_str}</td>
-                    <td>{supply_str}</td>
-                    <td class="{gap_class}">${proj.get('gap_B', 0):+.0f}</td>
-                    <td>{proj.get('status', 'N/A').upper()}</td>
-                    <td><span class="signal-badge badge-{'GREEN' if proj.get('risk_level') == 'LOW' else ('YELLOW' if proj.get('risk_level') == 'MEDIUM' else 'RED')}">{proj.get('risk_level', 'N/A')}</span></td>
-                </tr>
-""")
-                html_parts.append("""
-            </tbody>
-        </table>
-""")
-
-        # Recommendations
-        if funding_health:
-            recommendations = funding_health.get("overall_assessment", {}).get("recommendations", [])
-            if recommendations:
-                html_parts.append("""
-        <h2>Recommendations</h2>
-""")
-                for rec in recommendations:
-                    html_parts.append(f'        <div class="recommendation">{rec}</div>\n')
+        # Only a handful of ranks, so bucket by rank instead of sorting with a key function;
+        # concatenating the buckets keeps the input order within a level, like a stable sort.
+        # GREEN signals are dropped in the same pass
+        buckets = [[] for _ in range(_ALERT_RANK_LAST + 1)]
+        for signal in signals:
+            level = signal.get("alert_level")
+            if level != "GREEN":
+                buckets[_ALERT_RANK.get(level, _ALERT_RANK_LAST)].append(signal)
+        sorted_signals = list(chain.from_iterable(buckets))
+
+        # Nested sections looked up once, for the template and the recommendations list
+        overall = (funding_health or _EMPTY).get("overall_assessment") or _EMPTY
+        balance = (supply_demand or _EMPTY).get("balance_analysis") or _EMPTY
+        signals_summary = warning_data.get("signals_summary") or _EMPTY
+        sd_get = (supply_demand or _EMPTY).get
+
+        return dict(
+            generated=(warning_data.get("timestamp") or _timestamp("%Y-%m-%dT%H:%M:%S"))[:19],
+            alert_level=alert_level,
+            alert_style=_alert_style(alert_level),
+            composite_score=composite_score,
+            health_score_color=health_score_color,
+            by_severity=signals_summary.get("by_severity") or _EMPTY,
+            funding_health=funding_health,
+            overall=overall,
+            supply_demand=supply_demand,
+            balance=balance,
+            signal_rows=_format_signal_rows(sorted_signals),
+            historical=_format_supply_demand_rows(sd_get("historical", [])),
+            projections=_format_supply_demand_rows(sd_get("projections", [])),
+            recommendations=overall.get("recommendations", []),
+            charts=charts,
+        )
 
-        # Charts section
-        html_parts.append("""
-        <h2>Visualizations</h2>
-""")
+    def generate_warning_html_report(self, warning_data: Dict, funding_health: Dict = None,
+                                     supply_demand: Dict = None) -> str:
+        """Generate HTML report for warning system
 
+        Returns:
+            Path of the written report
+        """
         # Check for warning system chart images
         warning_charts = [
             ("warning_signals.png", "Warning Signal Status"),
@@ -1079,41 +1506,58 @@ class RiskDashboard:
             ("funding_health_gauge.png", "Funding Health Score"),
             ("credit_market_trends.png", "Credit Market Trends"),
         ]
-
-        for filename, title in warning_charts:
-            chart_path = self.output_dir / filename
-            if chart_path.exists():
-                html_parts.append(f"""
-        <div class="chart-container">
-            <h3>{title}</h3>
-            <img src="{filename}" alt="{title}">
-        </div>
-""")
-
-        # Footer
-        html_parts.append("""
-        <div class="footer">
-            <p>AI Funding Risk Early Warning System - Automated Analysis Report</p>
-            <p>Data sources: SEC EDGAR, FRED (Federal Reserve), Yahoo Finance</p>
-            <p>This report is for informational purposes only and should not be considered financial advice.</p>
-        </div>
-    </div>
-</body>
-</html>
-""")
-
-        html_content = "".join(html_parts)
-
-        # Save HTML report
-        output_path = self.output_dir / "warning_dashboard.html"
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write(html_content)
+        charts = self._available_charts(warning_charts)
+
+        # Identical inputs render identical HTML, so the chart fingerprint store records the hash
+        # of the inputs behind the current page and a run with the same inputs skips the render.
+        # The code and template versions are inputs too, so an upgrade re-renders the page
+        versions = [os.stat(path).st_mtime_ns for path in (_MODULE_PATH, self._warning_template.filename)]
+        input_hash = hashlib.blake2b(
+            json.dumps([warning_data, funding_health, supply_demand, charts, versions, self.write_gzip],
+                       sort_keys=True, default=str).encode("utf-8"),
+            digest_size=16,
+        ).hexdigest()
+        output_path = self._output_path("warning_dashboard.html")
+        gzip_path = output_path + ".gz"
+        output_paths = (output_path, gzip_path) if self.write_gzip else (output_path,)
+        fingerprints = self._read_fingerprints()
+        if all(self._fingerprint_matches(fingerprints, path, input_hash) for path in output_paths):
+            print(f"Up to date: {output_path}")
+            return output_path
+
+        # Stream the rendered template into the page (and its gzip copy, if enabled) in one pass,
+        # instead of building the whole page first
+        context = self._warning_context(warning_data, funding_health, supply_demand, charts)
+        with ExitStack() as stack:
+            files = [stack.enter_context(open(output_path, "wb", buffering=HTML_WRITE_BUFFER))]
+            if self.write_gzip:
+                gz_file = stack.enter_context(open(gzip_path, "wb"))
+                files.append(stack.enter_context(
+                    gzip.GzipFile(fileobj=gz_file, mode="wb", compresslevel=6, mtime=0)))
+            for chunk in self._warning_template.generate(context):
+                data = chunk.encode("utf-8")
+                for f in files:
+                    f.write(data)
+
+        if not self.write_gzip:
+            # A copy left from a run with write_gzip on would now serve an outdated page
+            try:
+                os.remove(gzip_path)
+            except FileNotFoundError:
+                pass
+
+        # An interrupted write leaves new mtimes behind, so the old entries no longer match
+        self._update_fingerprints(dict.fromkeys(output_paths, input_hash))
 
         print(f"Saved: {output_path}")
-        return html_content
+        return output_path
 
     def generate_company_historical_html(self, consolidated_data: Dict) -> str:
-        """Generate company historical analysis HTML with category-based charts for OCF breakdown and funding sources"""
+        """Generate company historical analysis HTML with category-based charts for OCF breakdown and funding sources
+
+        Returns:
+            Path of the written page
+        """
         companies_data = consolidated_data.get("companies", {})
 
         # Company color mapping
@@ -1127,7 +1571,7 @@ class RiskDashboard:
         }
 
         # Build JavaScript data object from consolidated data
-        js_data_parts = []
+        company_data = {}
         for company_name, company_info in companies_data.items():
             yahoo_hist = company_info.get("yahoo_historical", {})
             color = company_colors.get(company_name, "#888888")
@@ -1144,1035 +1588,169 @@ class RiskDashboard:
             ocf_breakdown_by_year = {}
             for item in yahoo_hist.get("ocf_breakdown", []):
                 year = item["year"]
-                ocf_breakdown_by_year[year] = {
-                    "netIncome": item.get("net_income", 0),
-                    "depreciation": item.get("depreciation", 0),
-                    "stockComp": item.get("stock_compensation", 0),
-                    "workingCapital": item.get("working_capital", 0),
-                    "deferredTax": item.get("deferred_tax", 0),
-                    "other": item.get("other", 0)
-                }
+                ocf_breakdown_by_year[year] = {js_key: item.get(key, 0) for js_key, key in OCF_BREAKDOWN_FIELDS}
 
             # Build funding sources by year
             funding_by_year = {}
             for item in yahoo_hist.get("funding_sources", []):
                 year = item["year"]
-                funding_by_year[year] = {
-                    "capex": item.get("capex", 0),
-                    "ocf": item.get("ocf", 0),
-                    "fcf": item.get("free_cashflow", 0),
-                    "debtIssue": item.get("debt_issuance", 0),
-                    "debtPayment": item.get("debt_payment", 0),
-                    "stockIssue": item.get("stock_issuance", 0),
-                    "buyback": item.get("stock_repurchase", 0),
-                    "dividend": item.get("dividends", 0)
-                }
-
-            # Format for JavaScript
-            capex_js = "{ " + ", ".join([f"{y}: {capex_by_year.get(y) if capex_by_year.get(y) is not None else 'null'}" for y in [2021, 2022, 2023, 2024, 2025]]) + " }"
-            ocf_js = "{ " + ", ".join([f"{y}: {ocf_by_year.get(y) if ocf_by_year.get(y) is not None else 'null'}" for y in [2021, 2022, 2023, 2024, 2025]]) + " }"
-
-            # OCF breakdown
-            ocf_breakdown_js_parts = []
-            for year in [2021, 2022, 2023, 2024, 2025]:
-                if year in ocf_breakdown_by_year:
-                    b = ocf_breakdown_by_year[year]
-                    ocf_breakdown_js_parts.append(
-                        f"{year}: {{ netIncome: {b['netIncome']}, depreciation: {b['depreciation']}, "
-                        f"stockComp: {b['stockComp']}, workingCapital: {b['workingCapital']}, "
-                        f"deferredTax: {b['deferredTax']}, other: {b['other']} }}"
-                    )
-            ocf_breakdown_js = "{ " + ", ".join(ocf_breakdown_js_parts) + " }"
-
-            # Funding sources
-            funding_js_parts = []
-            for year in [2021, 2022, 2023, 2024, 2025]:
-                if year in funding_by_year:
-                    f = funding_by_year[year]
-                    funding_js_parts.append(
-                        f"{year}: {{ capex: {f['capex']}, ocf: {f['ocf']}, fcf: {f['fcf']}, "
-                        f"debtIssue: {f['debtIssue']}, debtPayment: {f['debtPayment']}, stockIssue: {f['stockIssue']}, "
-                        f"buyback: {f['buyback']}, dividend: {f['dividend']} }}"
-                    )
-            funding_js = "{ " + ", ".join(funding_js_parts) + " }"
-
-            js_data_parts.append(f"""            {company_name}: {{
-                color: '{color}',
-                capex: {capex_js},
-                ocf: {ocf_js},
-                ocfBreakdown: {ocf_breakdown_js},
-                funding: {funding_js}
-            }}""")
-
-        company_data_js = ",\n".join(js_data_parts)
+                funding_by_year[year] = {js_key: item.get(key, 0) for js_key, key in FUNDING_FIELDS}
+
+            # Years with an OCF breakdown drive the per-company charts and tables
+            available_years = [y for y in HISTORICAL_YEARS if y in ocf_breakdown_by_year]
+
+            # JSON object literals are valid JavaScript; year keys become strings,
+            # which is how JS property lookup treats numeric keys anyway
+            company_data[company_name] = {
+                "color": color,
+                "capex": {key: capex_by_year.get(y) for y, key in _HISTORICAL_YEAR_KEYS},
+                "ocf": {key: ocf_by_year.get(y) for y, key in _HISTORICAL_YEAR_KEYS},
+                "ocfBreakdown": {key: ocf_breakdown_by_year[y] for y, key in _HISTORICAL_YEAR_KEYS
+                                 if y in ocf_breakdown_by_year},
+                "funding": {key: funding_by_year[y] for y, key in _HISTORICAL_YEAR_KEYS if y in funding_by_year},
+                "availableYears": available_years,
+                "latestYear": available_years[-1] if available_years else HISTORICAL_YEARS[-1],
+            }
 
         # Generate timestamp
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
-        html_content = f'''<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Company Historical Demand & Supply Analysis</title>
-    <script src="https://cdn.jsdelivr.net/npm/chart.js"></script>
-    <style>
-        * {{ margin: 0; padding: 0; box-sizing: border-box; }}
-        body {{
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-            background: linear-gradient(135deg, #1a1a2e 0%, #16213e 100%);
-            min-height: 100vh; padding: 20px; color: #e4e4e4;
-        }}
-        .container {{ max-width: 1600px; margin: 0 auto; }}
-        h1 {{ text-align: center; margin-bottom: 10px; color: #4dabf7; font-size: 1.8em; }}
-        .subtitle {{ text-align: center; color: #868e96; margin-bottom: 20px; font-size: 0.9em; }}
-        .section-title {{
-            color: #4dabf7; font-size: 1.3em; margin: 30px 0 15px 0;
-            padding-bottom: 10px; border-bottom: 1px solid rgba(77, 171, 247, 0.3);
-        }}
-        .section-desc {{ color: #868e96; font-size: 0.85em; margin-bottom: 15px; }}
-        .subsection-title {{ color: #74c0fc; font-size: 1.1em; margin: 20px 0 10px 0; }}
-        .charts-container {{
-            display: grid; grid-template-columns: 1fr 1fr; gap: 20px; margin-bottom: 20px;
-        }}
-        .charts-container.three-col {{ grid-template-columns: repeat(3, 1fr); }}
-        .chart-box {{
-            background: rgba(255,255,255,0.05); border-radius: 12px; padding: 20px;
-            border: 1px solid rgba(255,255,255,0.1);
-        }}
-        .chart-box.full-width {{ grid-column: 1 / -1; }}
-        .chart-title {{
-            font-size: 1em; color: #fff; margin-bottom: 15px;
-            display: flex; align-items: center; gap: 8px;
-        }}
-        .chart-title .icon {{ font-size: 1.1em; }}
-        .chart-header {{
-            display: flex; justify-content: space-between; align-items: center; margin-bottom: 15px;
-        }}
-        .chart-wrapper {{ height: 280px; position: relative; }}
-        .chart-wrapper.tall {{ height: 350px; }}
-        .filters {{
-            background: rgba(255,255,255,0.05); border-radius: 12px; padding: 20px;
-            margin-bottom: 20px; border: 1px solid rgba(255,255,255,0.1);
-        }}
-        .filter-title {{ font-size: 1em; color: #fff; margin-bottom: 15px; }}
-        .filter-groups {{ display: flex; gap: 40px; flex-wrap: wrap; }}
-        .filter-group {{ display: flex; flex-wrap: wrap; gap: 10px; align-items: center; }}
-        .filter-group-label {{ color: #868e96; font-size: 0.85em; margin-right: 10px; }}
-        .filter-btn {{
-            padding: 8px 16px; border: none; border-radius: 20px; cursor: pointer;
-            font-size: 0.85em; transition: all 0.2s; background: rgba(255,255,255,0.1); color: #e4e4e4;
-        }}
-        .filter-btn:hover {{ background: rgba(255,255,255,0.2); }}
-        .filter-btn.active {{ color: #fff; font-weight: 500; }}
-        .filter-btn.amazon.active {{ background: #ff9900; }}
-        .filter-btn.microsoft.active {{ background: #00a4ef; }}
-        .filter-btn.alphabet.active {{ background: #4285f4; }}
-        .filter-btn.meta.active {{ background: #0866ff; }}
-        .filter-btn.oracle.active {{ background: #f80000; }}
-        .filter-btn.nvidia.active {{ background: #76b900; }}
-        .filter-btn.all.active {{ background: #4dabf7; }}
-        .company-select {{
-            padding: 8px 16px; border-radius: 8px; background: rgba(255,255,255,0.1);
-            color: #e4e4e4; border: 1px solid rgba(255,255,255,0.2); font-size: 0.9em; cursor: pointer;
-        }}
-        .company-select option {{ background: #1a1a2e; color: #e4e4e4; }}
-        .data-table {{
-            background: rgba(255,255,255,0.05); border-radius: 12px; padding: 20px;
-            border: 1px solid rgba(255,255,255,0.1); overflow-x: auto; margin-bottom: 20px;
-        }}
-        .data-table table {{ width: 100%; border-collapse: collapse; font-size: 0.85em; }}
-        .data-table th, .data-table td {{
-            padding: 10px 12px; text-align: right; border-bottom: 1px solid rgba(255,255,255,0.1);
-        }}
-        .data-table th {{ color: #4dabf7; font-weight: 600; }}
-        .data-table th:first-child, .data-table td:first-child {{ text-align: left; }}
-        .data-table tr:hover {{ background: rgba(255,255,255,0.05); }}
-        .growth-positive {{ color: #51cf66; }}
-        .growth-negative {{ color: #ff6b6b; }}
-        .company-legend {{
-            display: flex; flex-wrap: wrap; gap: 15px; justify-content: center;
-            padding: 15px; background: rgba(255,255,255,0.03); border-radius: 8px;
-            margin-bottom: 20px;
-        }}
-        .legend-item {{ display: flex; align-items: center; gap: 6px; font-size: 0.85em; }}
-        .legend-color {{ width: 12px; height: 12px; border-radius: 2px; }}
-        .legend-custom {{
-            display: flex; flex-wrap: wrap; gap: 15px; justify-content: center;
-            margin-top: 10px; font-size: 0.85em;
-        }}
-        .table-header {{ display: flex; justify-content: space-between; align-items: center; margin-bottom: 15px; }}
-        .table-header h3 {{ color: #4dabf7; margin: 0; }}
-        .generated-info {{ text-align: center; color: #868e96; font-size: 0.8em; margin-top: 30px; }}
-        .sticky-header {{
-            position: sticky; top: 0; z-index: 100;
-            background: linear-gradient(135deg, #1a1a2e 0%, #16213e 100%);
-            padding: 15px 0; margin: 0 -20px; padding-left: 20px; padding-right: 20px;
-            transition: box-shadow 0.3s ease;
-        }}
-        .sticky-header.scrolled {{ box-shadow: 0 4px 20px rgba(0,0,0,0.5); }}
-        /* Cash Flow Framework Diagram Styles */
-        .framework-diagram {{
-            display: flex; gap: 20px; margin: 20px 0; padding: 20px;
-            background: rgba(0,0,0,0.2); border-radius: 12px;
-        }}
-        .framework-section {{
-            flex: 1; padding: 15px; border-radius: 10px;
-        }}
-        .framework-section.sources {{
-            background: linear-gradient(135deg, rgba(81, 207, 102, 0.15) 0%, rgba(81, 207, 102, 0.05) 100%);
-            border: 1px solid rgba(81, 207, 102, 0.3);
-        }}
-        .framework-section.uses {{
-            background: linear-gradient(135deg, rgba(255, 107, 107, 0.15) 0%, rgba(255, 107, 107, 0.05) 100%);
-            border: 1px solid rgba(255, 107, 107, 0.3);
-        }}
-        .framework-section h4 {{
-            color: #4dabf7; font-size: 0.95em; margin-bottom: 15px;
-            padding-bottom: 8px; border-bottom: 1px solid rgba(255,255,255,0.1);
-        }}
-        .framework-items {{ display: flex; flex-direction: column; gap: 10px; }}
-        .framework-item {{
-            display: flex; align-items: center; gap: 10px; padding: 10px;
-            background: rgba(255,255,255,0.05); border-radius: 8px;
-            border-left: 3px solid #868e96;
-            cursor: pointer; transition: all 0.2s ease;
-        }}
-        .framework-item:hover {{
-            background: rgba(255,255,255,0.12);
-            transform: translateX(5px);
-        }}
-        .framework-item::after {{
-            content: '→'; margin-left: auto; color: #868e96; font-size: 0.9em;
-            opacity: 0; transition: opacity 0.2s;
-        }}
-        .framework-item:hover::after {{ opacity: 1; }}
-        .framework-item.no-chart {{
-            cursor: default; opacity: 0.6;
-        }}
-        .framework-item.no-chart:hover {{
-            background: rgba(255,255,255,0.05);
-            transform: none;
-        }}
-        .framework-item.no-chart::after {{ display: none; }}
-        .framework-item.primary {{ border-left-color: #51cf66; }}
-        .framework-item.secondary {{ border-left-color: #4dabf7; }}
-        .framework-item.critical {{ border-left-color: #ff6b6b; }}
-        .item-icon {{ font-size: 1.2em; }}
-        .item-label {{ font-weight: 600; color: #fff; min-width: 100px; }}
-        .item-desc {{ font-size: 0.8em; color: #868e96; }}
-        .framework-center {{
-            display: flex; flex-direction: column; justify-content: center; align-items: center;
-            padding: 20px; min-width: 180px;
-        }}
-        .balance-symbol {{ font-size: 2.5em; color: #4dabf7; margin-bottom: 15px; }}
-        .formula-box {{
-            background: rgba(77, 171, 247, 0.15); border: 1px solid rgba(77, 171, 247, 0.4);
-            border-radius: 10px; padding: 15px; text-align: center;
-            cursor: pointer; transition: all 0.2s ease;
-        }}
-        .formula-box:hover {{
-            background: rgba(77, 171, 247, 0.25);
-            transform: scale(1.02);
-        }}
-        html {{ scroll-behavior: smooth; }}
-        .formula-title {{ font-size: 0.8em; color: #74c0fc; margin-bottom: 8px; }}
-        .formula {{ font-size: 1.1em; font-weight: 700; color: #4dabf7; font-family: monospace; }}
-        .formula-note {{ font-size: 0.75em; color: #868e96; margin-top: 8px; }}
-        .framework-insight {{
-            margin-top: 15px; padding: 12px 15px; background: rgba(255, 193, 7, 0.1);
-            border-left: 3px solid #ffc107; border-radius: 0 8px 8px 0; font-size: 0.85em; color: #e4e4e4;
-        }}
-        .framework-insight strong {{ color: #ffc107; }}
-        .relationship-note {{
-            margin: 15px 0 20px 0; padding: 15px; background: rgba(77, 171, 247, 0.1);
-            border-radius: 10px; border: 1px solid rgba(77, 171, 247, 0.2);
-        }}
-        .relationship-note strong {{ color: #4dabf7; }}
-        .relationship-note ul {{ margin: 10px 0 0 20px; }}
-        .relationship-note li {{ margin: 5px 0; font-size: 0.85em; color: #e4e4e4; }}
-        .relationship-note .highlight {{ color: #51cf66; font-weight: 600; font-family: monospace; }}
-        @media (max-width: 1400px) {{ .charts-container.three-col {{ grid-template-columns: repeat(2, 1fr); }} }}
-        @media (max-width: 1000px) {{
-            .charts-container, .charts-container.three-col {{ grid-template-columns: 1fr; }}
-            .framework-diagram {{ flex-direction: column; }}
-            .framework-center {{ flex-direction: row; gap: 20px; }}
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <h1>Company Historical Demand & Supply Analysis</h1>
-        <p class="subtitle">AI Infrastructure Investment Trends with Financial Breakdown (Calendar Year Aligned)</p>
-
-        <div class="sticky-header" id="stickyHeader">
-            <div class="filters">
-                <div class="filter-title">Filter Companies</div>
-                <div class="filter-groups">
-                    <div class="filter-group">
-                        <span class="filter-group-label">Quick:</span>
-                        <button class="filter-btn all active" onclick="toggleAll()">All Companies</button>
-                    </div>
-                    <div class="filter-group">
-                        <span class="filter-group-label">Select:</span>
-                        <button class="filter-btn amazon active" data-company="Amazon" onclick="toggleCompany(this)">Amazon</button>
-                        <button class="filter-btn microsoft active" data-company="Microsoft" onclick="toggleCompany(this)">Microsoft</button>
-                        <button class="filter-btn alphabet active" data-company="Alphabet" onclick="toggleCompany(this)">Alphabet</button>
-                        <button class="filter-btn meta active" data-company="Meta" onclick="toggleCompany(this)">Meta</button>
-                        <button class="filter-btn oracle active" data-company="Oracle" onclick="toggleCompany(this)">Oracle</button>
-                        <button class="filter-btn nvidia active" data-company="Nvidia" onclick="toggleCompany(this)">Nvidia</button>
-                    </div>
-                </div>
-            </div>
-            <div class="company-legend" id="companyLegend"></div>
-        </div>
-
-        <h2 class="section-title">1. Demand (CapEx) vs Supply (OCF) Overview</h2>
-        <p class="section-desc">Capital expenditure (Demand) and Operating Cash Flow (Supply) trends - Line charts comparing all companies</p>
-        <div class="charts-container">
-            <div class="chart-box">
-                <div class="chart-title"><span class="icon">📈</span> CapEx Trend ($B)</div>
-                <div class="chart-wrapper tall"><canvas id="demandChart"></canvas></div>
-            </div>
-            <div class="chart-box" id="chart-ocf">
-                <div class="chart-title"><span class="icon">💰</span> OCF Trend ($B)</div>
-                <div class="chart-wrapper tall"><canvas id="supplyChart"></canvas></div>
-            </div>
-        </div>
-
-        <h2 class="section-title">2. OCF Breakdown - What Generates Cash Flow?</h2>
-        <p class="section-desc">OCF (Operating Cash Flow) = Net Income + Non-Cash Adjustments + Working Capital Changes</p>
-        <div class="relationship-note" style="margin-top: 10px;">
-            <strong>OCF Component Definitions:</strong>
-            <ul>
-                <li><span class="highlight">Net Income</span> — Profit after all expenses and taxes (cash basis starting point)</li>
-                <li><span class="highlight">D&A (Depreciation & Amortization)</span> — Non-cash expense added back; spreads asset costs over time</li>
-                <li><span class="highlight">Stock Comp</span> — Stock-based compensation; non-cash expense added back</li>
-                <li><span class="highlight">Working Capital</span> — Changes in receivables, payables, inventory (negative = cash used)</li>
-                <li><span class="highlight">Deferred Tax</span> — Difference between tax expense and actual tax paid</li>
-                <li><span class="highlight">Other</span> — Other non-cash adjustments and reconciling items</li>
-            </ul>
-        </div>
-        <h3 class="subsection-title">2.1 Cross-Company Comparison ($B) - Line Charts</h3>
-        <p class="section-desc">Each chart shows absolute values for all companies</p>
-        <div class="charts-container three-col">
-            <div class="chart-box">
-                <div class="chart-title"><span class="icon">💵</span> Net Income ($B)</div>
-                <div class="chart-wrapper"><canvas id="netIncomeChart"></canvas></div>
-            </div>
-            <div class="chart-box">
-                <div class="chart-title"><span class="icon">🏭</span> D&A ($B)</div>
-                <div class="chart-wrapper"><canvas id="depreciationChart"></canvas></div>
-            </div>
-            <div class="chart-box">
-                <div class="chart-title"><span class="icon">🎁</span> Stock Comp ($B)</div>
-                <div class="chart-wrapper"><canvas id="stockCompChart"></canvas></div>
-            </div>
-            <div class="chart-box">
-                <div class="chart-title"><span class="icon">📦</span> Working Capital ($B)</div>
-                <div class="chart-wrapper"><canvas id="workingCapitalChart"></canvas></div>
-            </div>
-            <div class="chart-box">
-                <div class="chart-title"><span class="icon">📋</span> Deferred Tax ($B)</div>
-                <div class="chart-wrapper"><canvas id="deferredTaxChart"></canvas></div>
-            </div>
-            <div class="chart-box">
-                <div class="chart-title"><span class="icon">📊</span> Other ($B)</div>
-                <div class="chart-wrapper"><canvas id="otherChart"></canvas></div>
-            </div>
-        </div>
-        <h3 class="subsection-title">2.2 Within-Company Percentage Breakdown - Stacked Bar Chart</h3>
-        <p class="section-desc">Shows each OCF component as percentage of total OCF for the selected company</p>
-        <div class="charts-container">
-            <div class="chart-box full-width">
-                <div class="chart-header">
-                    <div class="chart-title"><span class="icon">📊</span> OCF Components % Breakdown by Year</div>
-                    <select class="company-select" id="ocfPctCompanySelect" onchange="updateOcfPctChart()">
-                        <option value="Amazon">Amazon</option>
-                        <option value="Microsoft">Microsoft</option>
-                        <option value="Alphabet">Alphabet</option>
-                        <option value="Meta">Meta</option>
-                        <option value="Oracle">Oracle</option>
-                        <option value="Nvidia">Nvidia</option>
-                    </select>
-                </div>
-                <div class="chart-wrapper tall"><canvas id="ocfPctBarChart"></canvas></div>
-                <div class="legend-custom">
-                    <div class="legend-item"><div class="legend-color" style="background:#51cf66"></div>Net Income</div>
-                    <div class="legend-item"><div class="legend-color" style="background:#4dabf7"></div>D&A</div>
-                    <div class="legend-item"><div class="legend-color" style="background:#be4bdb"></div>Stock Comp</div>
-                    <div class="legend-item"><div class="legend-color" style="background:#fcc419"></div>Working Capital</div>
-                    <div class="legend-item"><div class="legend-color" style="background:#ff6b6b"></div>Deferred Tax</div>
-                    <div class="legend-item"><div class="legend-color" style="background:#868e96"></div>Other</div>
-                </div>
-            </div>
-        </div>
-
-        <h2 class="section-title">3. Cash Flow Framework - Sources vs Uses</h2>
-        <p class="section-desc">Understanding how cash flows through the company: where it comes from (Sources) and where it goes (Uses)</p>
-        <div class="chart-box full-width" style="margin-bottom: 20px;">
-            <div class="chart-title"><span class="icon">📐</span> Cash Flow Balance Framework</div>
-            <div class="framework-diagram">
-                <div class="framework-section sources">
-                    <h4>SOURCES (Cash Inflows)</h4>
-                    <div class="framework-items">
-                        <div class="framework-item primary" onclick="scrollToChart('chart-ocf')" title="View OCF Chart">
-                            <span class="item-icon">💰</span>
-                            <span class="item-label">OCF</span>
-                            <span class="item-desc">Operating Cash Flow - cash from business operations</span>
-                        </div>
-                        <div class="framework-item secondary" onclick="scrollToChart('chart-debt')" title="View Debt Issuance Chart">
-                            <span class="item-icon">🏦</span>
-                            <span class="item-label">Debt Issuance</span>
-                            <span class="item-desc">Long-term debt borrowed when OCF insufficient</span>
-                        </div>
-                        <div class="framework-item secondary" onclick="scrollToChart('chart-stock-issue')" title="View Stock Issuance Chart">
-                            <span class="item-icon">📈</span>
-                            <span class="item-label">Stock Issuance</span>
-                            <span class="item-desc">New equity raised from investors</span>
-                        </div>
-                    </div>
-                </div>
-                <div class="framework-center">
-                    <div class="balance-symbol">=</div>
-                    <div class="formula-box" onclick="scrollToChart('chart-fcf')" title="View FCF Chart">
-                        <div class="formula-title">Key Relationship</div>
-                        <div class="formula">FCF = OCF - CapEx</div>
-                        <div class="formula-note">Free Cash Flow is what remains after infrastructure investment</div>
-                    </div>
-                </div>
-                <div class="framework-section uses">
-                    <h4>USES (Cash Outflows)</h4>
-                    <div class="framework-items">
-                        <div class="framework-item critical" onclick="scrollToChart('chart-capex')" title="View CapEx Chart">
-                            <span class="item-icon">📈</span>
-                            <span class="item-label">CapEx</span>
-                            <span class="item-desc">Capital Expenditure - investment in infrastructure/AI</span>
-                        </div>
-                        <div class="framework-item" onclick="scrollToChart('chart-buyback')" title="View Buybacks Chart">
-                            <span class="item-icon">🔄</span>
-                            <span class="item-label">Buybacks</span>
-                            <span class="item-desc">Share repurchases - returning cash to shareholders</span>
-                        </div>
-                        <div class="framework-item" onclick="scrollToChart('chart-dividend')" title="View Dividends Chart">
-                            <span class="item-icon">💎</span>
-                            <span class="item-label">Dividends</span>
-                            <span class="item-desc">Cash dividends paid to shareholders</span>
-                        </div>
-                        <div class="framework-item" onclick="scrollToChart('chart-debt-payment')" title="View Debt Repayment Chart">
-                            <span class="item-icon">📉</span>
-                            <span class="item-label">Debt Repayment</span>
-                            <span class="item-desc">Principal repayment of existing debt</span>
-                        </div>
-                    </div>
-                </div>
-            </div>
-            <div class="framework-insight">
-                <strong>Key Insight:</strong> When CapEx exceeds OCF (negative FCF), companies must rely on debt or equity issuance to fund growth.
-                This dashboard tracks whether AI infrastructure investment (CapEx) is sustainable from operating cash flows (OCF).
-            </div>
-        </div>
+        timestamp = _timestamp("%Y-%m-%d %H:%M:%S")
+
+        # Embedded as application/json blocks, in sentinel order after the timestamp
+        payloads = (
+            company_data,
+            _build_line_series(company_data),
+            _build_chart_payload(company_data),
+            _build_table_rows(company_data),
+        )
 
-        <h2 class="section-title">4. Funding & Cash Allocation - How is Cash Used?</h2>
-        <h3 class="subsection-title">4.1 Cross-Company Comparison ($B) - Line Charts</h3>
-        <p class="section-desc">Tracking CapEx (investment demand), FCF (remaining after investment), Debt (external funding), and shareholder returns</p>
-        <div class="charts-container three-col" id="section-funding">
-            <div class="chart-box" id="chart-capex">
-                <div class="chart-title"><span class="icon">📈</span> CapEx ($B)</div>
-                <div class="chart-wrapper"><canvas id="capexFundingChart"></canvas></div>
-            </div>
-            <div class="chart-box" id="chart-fcf">
-                <div class="chart-title"><span class="icon">💸</span> Free Cash Flow ($B)</div>
-                <div class="chart-wrapper"><canvas id="fcfChart"></canvas></div>
-            </div>
-            <div class="chart-box" id="chart-debt">
-                <div class="chart-title"><span class="icon">🏦</span> Debt Issuance ($B)</div>
-                <div class="chart-wrapper"><canvas id="debtChart"></canvas></div>
-            </div>
-            <div class="chart-box" id="chart-buyback">
-                <div class="chart-title"><span class="icon">🔄</span> Stock Buybacks ($B)</div>
-                <div class="chart-wrapper"><canvas id="buybackChart"></canvas></div>
-            </div>
-            <div class="chart-box" id="chart-dividend">
-                <div class="chart-title"><span class="icon">💎</span> Dividends ($B)</div>
-                <div class="chart-wrapper"><canvas id="dividendChart"></canvas></div>
-            </div>
-            <div class="chart-box" id="chart-stock-issue">
-                <div class="chart-title"><span class="icon">📈</span> Stock Issuance ($B)</div>
-                <div class="chart-wrapper"><canvas id="stockIssueChart"></canvas></div>
-            </div>
-            <div class="chart-box" id="chart-debt-payment">
-                <div class="chart-title"><span class="icon">📉</span> Debt Repayment ($B)</div>
-                <div class="chart-wrapper"><canvas id="debtPaymentChart"></canvas></div>
-            </div>
-        </div>
-        <div class="relationship-note">
-            <strong>Parameter Relationships:</strong>
-            <ul>
-                <li><span class="highlight">FCF = OCF - CapEx</span> — Free Cash Flow is Operating Cash Flow minus Capital Expenditure</li>
-                <li><span class="highlight">If FCF &gt; 0</span> — Company can fund buybacks/dividends from operations</li>
-                <li><span class="highlight">If FCF &lt; 0</span> — Company needs debt/equity issuance to fund CapEx</li>
-            </ul>
-        </div>
-        <h3 class="subsection-title" id="fundingPctSection">4.2 Within-Company Percentage Breakdown - Stacked Bar Chart</h3>
-        <p class="section-desc">Shows cash allocation as percentage of OCF for the selected company (CapEx + Buybacks + Dividends)</p>
-        <div class="charts-container">
-            <div class="chart-box full-width">
-                <div class="chart-header">
-                    <div class="chart-title"><span class="icon">📊</span> Cash Allocation % of OCF by Year</div>
-                    <select class="company-select" id="fundingPctCompanySelect" onchange="updateFundingPctChart()">
-                        <option value="Amazon">Amazon</option>
-                        <option value="Microsoft">Microsoft</option>
-                        <option value="Alphabet">Alphabet</option>
-                        <option value="Meta">Meta</option>
-                        <option value="Oracle">Oracle</option>
-                        <option value="Nvidia">Nvidia</option>
-                    </select>
-                </div>
-                <div class="chart-wrapper tall"><canvas id="fundingPctBarChart"></canvas></div>
-                <div class="legend-custom">
-                    <div class="legend-item"><div class="legend-color" style="background:#4dabf7"></div>CapEx</div>
-                    <div class="legend-item"><div class="legend-color" style="background:#be4bdb"></div>Buybacks</div>
-                    <div class="legend-item"><div class="legend-color" style="background:#fcc419"></div>Dividends</div>
-                </div>
-            </div>
-        </div>
+        # Stream the static parts and the JSON chunks straight into the file buffer instead of
+        # building the whole page as one string; newline="" keeps the template's line endings
+        output_path = self._output_path("company_historical.html")
+        head, timestamp_tail, *payload_tails = _COMPANY_HISTORICAL_PARTS
+        with open(output_path, "w", encoding="utf-8", newline="", buffering=HTML_WRITE_BUFFER) as f:
+            f.write(head)
+            f.write(timestamp)
+            f.write(timestamp_tail)
+            for payload, tail in zip(payloads, payload_tails):
+                # A "</" never spans two chunks (string tokens are whole), so escaping per chunk is
+                # enough to keep the data from closing the <script> tag
+                for chunk in _COMPACT_JSON.iterencode(payload):
+                    f.write(chunk.replace("</", "<\\/"))
+                f.write(tail)
 
-        <h2 class="section-title">5. Cross-Company Comparison (Latest Year)</h2>
-        <p class="section-desc">Stacked bar comparison showing OCF breakdown and capital allocation</p>
-        <div class="charts-container">
-            <div class="chart-box">
-                <div class="chart-title"><span class="icon">📊</span> OCF Components ($B)</div>
-                <div class="chart-wrapper tall"><canvas id="ocfComparisonChart"></canvas></div>
-            </div>
-            <div class="chart-box">
-                <div class="chart-title"><span class="icon">💹</span> Capital Allocation ($B)</div>
-                <div class="chart-wrapper tall"><canvas id="allocationComparisonChart"></canvas></div>
-            </div>
-        </div>
+        print(f"Saved: {output_path}")
+        return output_path
 
-        <h2 class="section-title">6. Detailed Data Tables</h2>
-        <div class="data-table">
-            <div class="table-header"><h3>CapEx & OCF Historical ($B)</h3></div>
-            <table id="mainTable">
-                <thead><tr><th>Company</th><th>Metric</th><th>2021</th><th>2022</th><th>2023</th><th>2024</th><th>2025</th><th>Growth</th></tr></thead>
-                <tbody id="mainTableBody"></tbody>
-            </table>
-        </div>
+    def _read_fingerprints(self) -> Dict[str, List]:
+        """Render fingerprints by absolute output path: [inputs digest, output mtime_ns when recorded]"""
+        try:
+            with open(self.cache_dir / "fingerprints.json", "rb") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
 
-        <div class="data-table">
-            <div class="table-header">
-                <h3>OCF Breakdown Historical ($B)</h3>
-                <select class="company-select" id="ocfTableCompanySelect" onchange="updateOcfTable()">
-                    <option value="all">All Companies (Latest Year)</option>
-                    <option value="Amazon">Amazon (Historical)</option>
-                    <option value="Microsoft">Microsoft (Historical)</option>
-                    <option value="Alphabet">Alphabet (Historical)</option>
-                    <option value="Meta">Meta (Historical)</option>
-                    <option value="Oracle">Oracle (Historical)</option>
-                    <option value="Nvidia">Nvidia (Historical)</option>
-                </select>
-            </div>
-            <table id="ocfTable"><thead id="ocfTableHead"></thead><tbody id="ocfTableBody"></tbody></table>
-        </div>
+    def _fingerprint_matches(self, fingerprints: Dict[str, List], output_path: str, digest: str) -> bool:
+        """Whether output_path was last written from inputs with this digest and is untouched since"""
+        entry = fingerprints.get(os.path.abspath(output_path))
+        return entry is not None and entry == [digest, _mtime_ns(output_path)]
 
-        <div class="data-table">
-            <div class="table-header">
-                <h3>Funding & Capital Allocation Historical ($B)</h3>
-                <select class="company-select" id="fundingTableCompanySelect" onchange="updateFundingTable()">
-                    <option value="all">All Companies (Latest Year)</option>
-                    <option value="Amazon">Amazon (Historical)</option>
-                    <option value="Microsoft">Microsoft (Historical)</option>
-                    <option value="Alphabet">Alphabet (Historical)</option>
-                    <option value="Meta">Meta (Historical)</option>
-                    <option value="Oracle">Oracle (Historical)</option>
-                    <option value="Nvidia">Nvidia (Historical)</option>
-                </select>
-            </div>
-            <table id="fundingTable"><thead id="fundingTableHead"></thead><tbody id="fundingTableBody"></tbody></table>
-        </div>
+    def _update_fingerprints(self, digests: Dict[str, str]):
+        """Record the digest behind each freshly written output, alongside its current mtime
 
-        <p class="generated-info">Auto-generated from consolidated_data.json on {timestamp}</p>
-    </div>
+        The file is re-read first, so entries recorded meanwhile by other instances survive.
+        """
+        fingerprints = self._read_fingerprints()
+        for output_path, digest in digests.items():
+            fingerprints[os.path.abspath(output_path)] = [digest, _mtime_ns(output_path)]
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self.cache_dir / "fingerprints.json"
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(fingerprints, f, sort_keys=True)
+        os.replace(tmp_path, path)
+
+    def _is_fresh(self, output_path: str, source_paths: List[Path]) -> bool:
+        """Whether output_path exists and is at least as new as every source file"""
+        try:
+            output_mtime = os.stat(output_path).st_mtime_ns
+            return all(os.stat(path).st_mtime_ns <= output_mtime for path in source_paths)
+        except FileNotFoundError:
+            return False
+
+    def render_charts(self, jobs: List[Tuple[str, Dict, Path]], force: bool = False,
+                      inline_svg: bool = False):
+        """Redraw the charts of independent plot_* calls that are not up to date
+
+        A chart counts as up to date when its PNG is newer than its source JSON and this module,
+        and its recorded fingerprint matches the current drawing settings (colors, DPIs, indicator
+        order) and the PNG's mtime.
 
-    <script>
-        // Data auto-generated from consolidated_data.json
-        const companyData = {{
-{company_data_js}
-        }};
-
-        const years = [2021, 2022, 2023, 2024, 2025];
-        let activeCompanies = new Set(Object.keys(companyData));
-
-        // All chart instances
-        let charts = {{}};
-
-        const componentColors = {{
-            netIncome: '#51cf66', depreciation: '#4dabf7', stockComp: '#be4bdb',
-            workingCapital: '#fcc419', deferredTax: '#ff6b6b', other: '#868e96'
-        }};
-
-        function getLatestYear(company) {{
-            const data = companyData[company];
-            for (let i = years.length - 1; i >= 0; i--) {{
-                if (data.ocfBreakdown[years[i]]) return years[i];
-            }}
-            return years[years.length - 1];
-        }}
-
-        function getAvailableYears(company) {{
-            return years.filter(y => companyData[company].ocfBreakdown[y]);
-        }}
-
-        // Common chart options
-        function getLineChartOptions(showLegend = false) {{
-            return {{
-                responsive: true, maintainAspectRatio: false,
-                plugins: {{
-                    legend: {{ display: showLegend, position: 'bottom', labels: {{ color: '#e4e4e4', usePointStyle: true, padding: 10 }} }},
-                    tooltip: {{ backgroundColor: 'rgba(0,0,0,0.8)', callbacks: {{ label: ctx => ctx.raw !== null ? `${{ctx.dataset.label}}: $${{ctx.raw.toFixed(2)}}B` : null }} }}
-                }},
-                scales: {{
-                    x: {{ grid: {{ color: 'rgba(255,255,255,0.1)' }}, ticks: {{ color: '#868e96' }} }},
-                    y: {{ grid: {{ color: 'rgba(255,255,255,0.1)' }}, ticks: {{ color: '#868e96', callback: v => '$' + v + 'B' }} }}
-                }}
-            }};
-        }}
-
-        // Create line chart datasets for a specific metric
-        function createLineDatasets(getValueFn) {{
-            return Object.entries(companyData).map(([name, data]) => ({{
-                label: name,
-                data: years.map(y => getValueFn(data, y)),
-                borderColor: data.color,
-                backgroundColor: data.color + '40',
-                borderWidth: 2,
-                pointRadius: 3,
-                tension: 0.3,
-                hidden: !activeCompanies.has(name),
-                spanGaps: true
-            }}));
-        }}
-
-        // Initialize company legend
-        function initCompanyLegend() {{
-            const legend = document.getElementById('companyLegend');
-            legend.innerHTML = Object.entries(companyData).map(([name, data]) =>
-                `<div class="legend-item"><div class="legend-color" style="background:${{data.color}}"></div>${{name}}</div>`
-            ).join('');
-        }}
-
-        function initCharts() {{
-            initCompanyLegend();
-            initDemandSupplyCharts();
-            initOcfBreakdownCharts();
-            initFundingSourceCharts();
-            initComparisonCharts();
-            initPercentageCharts();
-            updateAllTables();
-        }}
-
-        function initDemandSupplyCharts() {{
-            charts.demand = new Chart(document.getElementById('demandChart'), {{
-                type: 'line',
-                data: {{ labels: years, datasets: createLineDatasets((data, y) => data.capex[y]) }},
-                options: getLineChartOptions(false)
-            }});
-            charts.supply = new Chart(document.getElementById('supplyChart'), {{
-                type: 'line',
-                data: {{ labels: years, datasets: createLineDatasets((data, y) => data.ocf[y]) }},
-                options: getLineChartOptions(false)
-            }});
-        }}
-
-        function initOcfBreakdownCharts() {{
-            // Net Income
-            charts.netIncome = new Chart(document.getElementById('netIncomeChart'), {{
-                type: 'line',
-                data: {{ labels: years, datasets: createLineDatasets((data, y) => data.ocfBreakdown[y]?.netIncome) }},
-                options: getLineChartOptions(false)
-            }});
-            // Depreciation
-            charts.depreciation = new Chart(document.getElementById('depreciationChart'), {{
-                type: 'line',
-                data: {{ labels: years, datasets: createLineDatasets((data, y) => data.ocfBreakdown[y]?.depreciation) }},
-                options: getLineChartOptions(false)
-            }});
-            // Stock Compensation
-            charts.stockComp = new Chart(document.getElementById('stockCompChart'), {{
-                type: 'line',
-                data: {{ labels: years, datasets: createLineDatasets((data, y) => data.ocfBreakdown[y]?.stockComp) }},
-                options: getLineChartOptions(false)
-            }});
-            // Working Capital
-            charts.workingCapital = new Chart(document.getElementById('workingCapitalChart'), {{
-                type: 'line',
-                data: {{ labels: years, datasets: createLineDatasets((data, y) => data.ocfBreakdown[y]?.workingCapital) }},
-                options: getLineChartOptions(false)
-            }});
-            // Deferred Tax
-            charts.deferredTax = new Chart(document.getElementById('deferredTaxChart'), {{
-                type: 'line',
-                data: {{ labels: years, datasets: createLineDatasets((data, y) => data.ocfBreakdown[y]?.deferredTax) }},
-                options: getLineChartOptions(false)
-            }});
-            // Other
-            charts.other = new Chart(document.getElementById('otherChart'), {{
-                type: 'line',
-                data: {{ labels: years, datasets: createLineDatasets((data, y) => data.ocfBreakdown[y]?.other) }},
-                options: getLineChartOptions(false)
-            }});
-        }}
-
-        function initFundingSourceCharts() {{
-            // CapEx (in funding section for comparison)
-            charts.capexFunding = new Chart(document.getElementById('capexFundingChart'), {{
-                type: 'line',
-                data: {{ labels: years, datasets: createLineDatasets((data, y) => data.funding[y]?.capex) }},
-                options: getLineChartOptions(false)
-            }});
-            // Free Cash Flow
-            charts.fcf = new Chart(document.getElementById('fcfChart'), {{
-                type: 'line',
-                data: {{ labels: years, datasets: createLineDatasets((data, y) => data.funding[y]?.fcf) }},
-                options: getLineChartOptions(false)
-            }});
-            // Debt Issuance
-            charts.debt = new Chart(document.getElementById('debtChart'), {{
-                type: 'line',
-                data: {{ labels: years, datasets: createLineDatasets((data, y) => data.funding[y]?.debtIssue) }},
-                options: getLineChartOptions(false)
-            }});
-            // Buybacks
-            charts.buyback = new Chart(document.getElementById('buybackChart'), {{
-                type: 'line',
-                data: {{ labels: years, datasets: createLineDatasets((data, y) => data.funding[y]?.buyback) }},
-                options: getLineChartOptions(false)
-            }});
-            // Dividends
-            charts.dividend = new Chart(document.getElementById('dividendChart'), {{
-                type: 'line',
-                data: {{ labels: years, datasets: createLineDatasets((data, y) => data.funding[y]?.dividend) }},
-                options: getLineChartOptions(false)
-            }});
-            // Stock Issuance
-            charts.stockIssue = new Chart(document.getElementById('stockIssueChart'), {{
-                type: 'line',
-                data: {{ labels: years, datasets: createLineDatasets((data, y) => data.funding[y]?.stockIssue) }},
-                options: getLineChartOptions(false)
-            }});
-            // Debt Payment
-            charts.debtPayment = new Chart(document.getElementById('debtPaymentChart'), {{
-                type: 'line',
-                data: {{ labels: years, datasets: createLineDatasets((data, y) => data.funding[y]?.debtPayment) }},
-                options: getLineChartOptions(false)
-            }});
-        }}
-
-        function initComparisonCharts() {{
-            const companies = Object.keys(companyData).filter(c => activeCompanies.has(c));
-
-            if (charts.ocfComparison) charts.ocfComparison.destroy();
-            const ocfDatasets = [
-                {{ label: 'Net Income', key: 'netIncome', color: componentColors.netIncome }},
-                {{ label: 'D&A', key: 'depreciation', color: componentColors.depreciation }},
-                {{ label: 'Stock Comp', key: 'stockComp', color: componentColors.stockComp }},
-                {{ label: 'Working Capital', key: 'workingCapital', color: componentColors.workingCapital }},
-                {{ label: 'Deferred Tax', key: 'deferredTax', color: componentColors.deferredTax }},
-                {{ label: 'Other', key: 'other', color: componentColors.other }}
-            ].map(item => ({{
-                label: item.label,
-                data: companies.map(c => {{ const year = getLatestYear(c); return companyData[c].ocfBreakdown[year]?.[item.key] || 0; }}),
-                backgroundColor: item.color
-            }}));
-            charts.ocfComparison = new Chart(document.getElementById('ocfComparisonChart'), {{
-                type: 'bar', data: {{ labels: companies, datasets: ocfDatasets }},
-                options: {{
-                    responsive: true, maintainAspectRatio: false,
-                    plugins: {{ legend: {{ position: 'bottom', labels: {{ color: '#e4e4e4', padding: 8, font: {{ size: 10 }} }} }}, tooltip: {{ backgroundColor: 'rgba(0,0,0,0.8)', callbacks: {{ label: ctx => `${{ctx.dataset.label}}: $${{ctx.raw.toFixed(2)}}B` }} }} }},
-                    scales: {{ x: {{ stacked: true, grid: {{ color: 'rgba(255,255,255,0.1)' }}, ticks: {{ color: '#e4e4e4' }} }}, y: {{ stacked: true, grid: {{ color: 'rgba(255,255,255,0.1)' }}, ticks: {{ color: '#868e96', callback: v => '$' + v + 'B' }} }} }}
-                }}
-            }});
-
-            if (charts.allocationComparison) charts.allocationComparison.destroy();
-            charts.allocationComparison = new Chart(document.getElementById('allocationComparisonChart'), {{
-                type: 'bar',
-                data: {{ labels: companies, datasets: [
-                    {{ label: 'CapEx', data: companies.map(c => {{ const y = getLatestYear(c); return companyData[c].funding[y]?.capex || 0; }}), backgroundColor: '#4dabf7' }},
-                    {{ label: 'Buybacks', data: companies.map(c => {{ const y = getLatestYear(c); return companyData[c].funding[y]?.buyback || 0; }}), backgroundColor: '#be4bdb' }},
-                    {{ label: 'Dividends', data: companies.map(c => {{ const y = getLatestYear(c); return companyData[c].funding[y]?.dividend || 0; }}), backgroundColor: '#fcc419' }}
-                ] }},
-                options: {{
-                    responsive: true, maintainAspectRatio: false,
-                    plugins: {{ legend: {{ position: 'bottom', labels: {{ color: '#e4e4e4', padding: 15 }} }}, tooltip: {{ backgroundColor: 'rgba(0,0,0,0.8)', callbacks: {{ label: ctx => `${{ctx.dataset.label}}: $${{ctx.raw.toFixed(2)}}B` }} }} }},
-                    scales: {{ x: {{ stacked: true, grid: {{ color: 'rgba(255,255,255,0.1)' }}, ticks: {{ color: '#e4e4e4' }} }}, y: {{ stacked: true, grid: {{ color: 'rgba(255,255,255,0.1)' }}, ticks: {{ color: '#868e96', callback: v => '$' + v + 'B' }}, beginAtZero: true }} }}
-                }}
-            }});
-        }}
-
-        // OCF Percentage Stacked Bar Chart (within-company)
-        function updateOcfPctChart() {{
-            const company = document.getElementById('ocfPctCompanySelect').value;
-            const data = companyData[company];
-            const availableYears = getAvailableYears(company);
-
-            if (charts.ocfPctBar) charts.ocfPctBar.destroy();
-
-            // Calculate percentages for each component
-            const datasets = [
-                {{ label: 'Net Income', key: 'netIncome', color: componentColors.netIncome }},
-                {{ label: 'D&A', key: 'depreciation', color: componentColors.depreciation }},
-                {{ label: 'Stock Comp', key: 'stockComp', color: componentColors.stockComp }},
-                {{ label: 'Working Capital', key: 'workingCapital', color: componentColors.workingCapital }},
-                {{ label: 'Deferred Tax', key: 'deferredTax', color: componentColors.deferredTax }},
-                {{ label: 'Other', key: 'other', color: componentColors.other }}
-            ].map(item => ({{
-                label: item.label,
-                data: availableYears.map(y => {{
-                    const ocf = data.ocf[y];
-                    const value = data.ocfBreakdown[y]?.[item.key] || 0;
-                    return ocf && ocf !== 0 ? (value / ocf) * 100 : 0;
-                }}),
-                backgroundColor: item.color,
-                borderColor: item.color,
-                borderWidth: 1
-            }}));
-
-            charts.ocfPctBar = new Chart(document.getElementById('ocfPctBarChart'), {{
-                type: 'bar',
-                data: {{ labels: availableYears, datasets }},
-                options: {{
-                    responsive: true, maintainAspectRatio: false,
-                    plugins: {{
-                        legend: {{ display: false }},
-                        tooltip: {{ backgroundColor: 'rgba(0,0,0,0.8)', callbacks: {{ label: ctx => `${{ctx.dataset.label}}: ${{ctx.raw.toFixed(1)}}%` }} }}
-                    }},
-                    scales: {{
-                        x: {{ stacked: true, grid: {{ color: 'rgba(255,255,255,0.1)' }}, ticks: {{ color: '#e4e4e4' }} }},
-                        y: {{ stacked: true, grid: {{ color: 'rgba(255,255,255,0.1)' }}, ticks: {{ color: '#868e96', callback: v => v + '%' }} }}
-                    }}
-                }}
-            }});
-        }}
-
-        // Funding Percentage Stacked Bar Chart (within-company)
-        function updateFundingPctChart() {{
-            const company = document.getElementById('fundingPctCompanySelect').value;
-            const data = companyData[company];
-            const availableYears = getAvailableYears(company);
-
-            if (charts.fundingPctBar) charts.fundingPctBar.destroy();
-
-            // Calculate percentages for CapEx, Buybacks, Dividends relative to OCF
-            const datasets = [
-                {{ label: 'CapEx', key: 'capex', color: '#4dabf7' }},
-                {{ label: 'Buybacks', key: 'buyback', color: '#be4bdb' }},
-                {{ label: 'Dividends', key: 'dividend', color: '#fcc419' }}
-            ].map(item => ({{
-                label: item.label,
-                data: availableYears.map(y => {{
-                    const ocf = data.ocf[y];
-                    const value = data.funding[y]?.[item.key] || 0;
-                    return ocf && ocf !== 0 ? (value / ocf) * 100 : 0;
-                }}),
-                backgroundColor: item.color,
-                borderColor: item.color,
-                borderWidth: 1
-            }}));
-
-            charts.fundingPctBar = new Chart(document.getElementById('fundingPctBarChart'), {{
-                type: 'bar',
-                data: {{ labels: availableYears, datasets }},
-                options: {{
-                    responsive: true, maintainAspectRatio: false,
-                    plugins: {{
-                        legend: {{ display: false }},
-                        tooltip: {{ backgroundColor: 'rgba(0,0,0,0.8)', callbacks: {{ label: ctx => `${{ctx.dataset.label}}: ${{ctx.raw.toFixed(1)}}%` }} }}
-                    }},
-                    scales: {{
-                        x: {{ stacked: true, grid: {{ color: 'rgba(255,255,255,0.1)' }}, ticks: {{ color: '#e4e4e4' }} }},
-                        y: {{ stacked: true, grid: {{ color: 'rgba(255,255,255,0.1)' }}, ticks: {{ color: '#868e96', callback: v => v + '%' }} }}
-                    }}
-                }}
-            }});
-        }}
-
-        function initPercentageCharts() {{
-            updateOcfPctChart();
-            updateFundingPctChart();
-        }}
-
-        function toggleCompany(btn) {{
-            const company = btn.dataset.company;
-            if (activeCompanies.has(company)) {{ activeCompanies.delete(company); btn.classList.remove('active'); }}
-            else {{ activeCompanies.add(company); btn.classList.add('active'); }}
-            document.querySelector('.filter-btn.all').classList.toggle('active', activeCompanies.size === Object.keys(companyData).length);
-            updateAllCharts();
-        }}
-
-        function toggleAll() {{
-            const allBtn = document.querySelector('.filter-btn.all');
-            const btns = document.querySelectorAll('.filter-btn[data-company]');
-            if (activeCompanies.size === Object.keys(companyData).length) {{
-                activeCompanies.clear(); allBtn.classList.remove('active'); btns.forEach(b => b.classList.remove('active'));
-            }} else {{
-                activeCompanies = new Set(Object.keys(companyData)); allBtn.classList.add('active'); btns.forEach(b => b.classList.add('active'));
-            }}
-            updateAllCharts();
-        }}
-
-        function updateAllCharts() {{
-            // Update all line charts visibility
-            const lineCharts = ['demand', 'supply', 'netIncome', 'depreciation', 'stockComp', 'workingCapital', 'deferredTax', 'other', 'capexFunding', 'fcf', 'debt', 'buyback', 'dividend', 'stockIssue', 'debtPayment'];
-            lineCharts.forEach(chartName => {{
-                if (charts[chartName]) {{
-                    charts[chartName].data.datasets.forEach(ds => ds.hidden = !activeCompanies.has(ds.label));
-                    charts[chartName].update();
-                }}
-            }});
-            initComparisonCharts();
-            updateAllTables();
-        }}
-
-        function updateAllTables() {{ updateMainTable(); updateOcfTable(); updateFundingTable(); }}
-
-        function updateMainTable() {{
-            const tbody = document.getElementById('mainTableBody'); tbody.innerHTML = '';
-            Object.entries(companyData).forEach(([name, data]) => {{
-                if (!activeCompanies.has(name)) return;
-                const capexValues = years.map(y => data.capex[y]).filter(v => v !== null);
-                const capexGrowth = capexValues.length >= 2 ? ((capexValues[capexValues.length-1] - capexValues[capexValues.length-2]) / capexValues[capexValues.length-2] * 100).toFixed(1) : null;
-                const capexRow = document.createElement('tr');
-                capexRow.innerHTML = `<td><span style="color:${{data.color}}">●</span> ${{name}}</td><td>CapEx</td>${{years.map(y => `<td>${{data.capex[y] !== null ? '$' + data.capex[y].toFixed(1) + 'B' : '-'}}</td>`).join('')}}<td class="${{capexGrowth > 0 ? 'growth-positive' : capexGrowth < 0 ? 'growth-negative' : ''}}">${{capexGrowth !== null ? (capexGrowth > 0 ? '+' : '') + capexGrowth + '%' : '-'}}</td>`;
-                tbody.appendChild(capexRow);
-                const ocfValues = years.map(y => data.ocf[y]).filter(v => v !== null);
-                const ocfGrowth = ocfValues.length >= 2 ? ((ocfValues[ocfValues.length-1] - ocfValues[ocfValues.length-2]) / ocfValues[ocfValues.length-2] * 100).toFixed(1) : null;
-                const ocfRow = document.createElement('tr');
-                ocfRow.innerHTML = `<td></td><td>OCF</td>${{years.map(y => `<td>${{data.ocf[y] !== null ? '$' + data.ocf[y].toFixed(1) + 'B' : '-'}}</td>`).join('')}}<td class="${{ocfGrowth > 0 ? 'growth-positive' : ocfGrowth < 0 ? 'growth-negative' : ''}}">${{ocfGrowth !== null ? (ocfGrowth > 0 ? '+' : '') + ocfGrowth + '%' : '-'}}</td>`;
-                tbody.appendChild(ocfRow);
-            }});
-        }}
-
-        function updateOcfTable() {{
-            const select = document.getElementById('ocfTableCompanySelect').value;
-            const thead = document.getElementById('ocfTableHead'); const tbody = document.getElementById('ocfTableBody');
-            if (select === 'all') {{
-                thead.innerHTML = `<tr><th>Company</th><th>Net Income</th><th>D&A</th><th>Stock Comp</th><th>Working Capital</th><th>Deferred Tax</th><th>Other</th><th>Total OCF</th></tr>`;
-                tbody.innerHTML = '';
-                Object.entries(companyData).forEach(([name, data]) => {{
-                    if (!activeCompanies.has(name)) return;
-                    const year = getLatestYear(name); const b = data.ocfBreakdown[year];
-                    const total = b.netIncome + b.depreciation + b.stockComp + b.workingCapital + b.deferredTax + b.other;
-                    const row = document.createElement('tr');
-                    row.innerHTML = `<td><span style="color:${{data.color}}">●</span> ${{name}} (${{year}})</td><td class="${{b.netIncome >= 0 ? 'growth-positive' : 'growth-negative'}}">$${{b.netIncome.toFixed(2)}}B</td><td>$${{b.depreciation.toFixed(2)}}B</td><td>$${{b.stockComp.toFixed(2)}}B</td><td class="${{b.workingCapital >= 0 ? 'growth-positive' : 'growth-negative'}}">$${{b.workingCapital.toFixed(2)}}B</td><td class="${{b.deferredTax >= 0 ? 'growth-positive' : 'growth-negative'}}">$${{b.deferredTax.toFixed(2)}}B</td><td>$${{b.other.toFixed(2)}}B</td><td style="font-weight:600">$${{total.toFixed(2)}}B</td>`;
-                    tbody.appendChild(row);
-                }});
-            }} else {{
-                const data = companyData[select]; const availableYears = getAvailableYears(select);
-                thead.innerHTML = `<tr><th>Year</th><th>Net Income</th><th>D&A</th><th>Stock Comp</th><th>Working Capital</th><th>Deferred Tax</th><th>Other</th><th>Total OCF</th></tr>`;
-                tbody.innerHTML = '';
-                availableYears.forEach(year => {{
-                    const b = data.ocfBreakdown[year]; const total = b.netIncome + b.depreciation + b.stockComp + b.workingCapital + b.deferredTax + b.other;
-                    const row = document.createElement('tr');
-                    row.innerHTML = `<td><span style="color:${{data.color}}">●</span> ${{year}}</td><td class="${{b.netIncome >= 0 ? 'growth-positive' : 'growth-negative'}}">$${{b.netIncome.toFixed(2)}}B</td><td>$${{b.depreciation.toFixed(2)}}B</td><td>$${{b.stockComp.toFixed(2)}}B</td><td class="${{b.workingCapital >= 0 ? 'growth-positive' : 'growth-negative'}}">$${{b.workingCapital.toFixed(2)}}B</td><td class="${{b.deferredTax >= 0 ? 'growth-positive' : 'growth-negative'}}">$${{b.deferredTax.toFixed(2)}}B</td><td>$${{b.other.toFixed(2)}}B</td><td style="font-weight:600">$${{total.toFixed(2)}}B</td>`;
-                    tbody.appendChild(row);
-                }});
-            }}
-        }}
-
-        function updateFundingTable() {{
-            const select = document.getElementById('fundingTableCompanySelect').value;
-            const thead = document.getElementById('fundingTableHead'); const tbody = document.getElementById('fundingTableBody');
-            if (select === 'all') {{
-                thead.innerHTML = `<tr><th>Company</th><th>CapEx</th><th>OCF</th><th>FCF</th><th>Debt Issued</th><th>Buybacks</th><th>Dividends</th></tr>`;
-                tbody.innerHTML = '';
-                Object.entries(companyData).forEach(([name, data]) => {{
-                    if (!activeCompanies.has(name)) return;
-                    const year = getLatestYear(name); const f = data.funding[year];
-                    const coverage = (f.ocf / f.capex * 100).toFixed(0);
-                    const row = document.createElement('tr');
-                    row.innerHTML = `<td><span style="color:${{data.color}}">●</span> ${{name}} (${{year}})</td><td>$${{f.capex.toFixed(2)}}B</td><td>$${{f.ocf.toFixed(2)}}B <span style="color:#868e96;font-size:0.8em">(${{coverage}}%)</span></td><td class="${{f.fcf >= 0 ? 'growth-positive' : 'growth-negative'}}">$${{f.fcf.toFixed(2)}}B</td><td>${{f.debtIssue > 0 ? '$' + f.debtIssue.toFixed(2) + 'B' : '-'}}</td><td>${{f.buyback > 0 ? '$' + f.buyback.toFixed(2) + 'B' : '-'}}</td><td>${{f.dividend > 0 ? '$' + f.dividend.toFixed(2) + 'B' : '-'}}</td>`;
-                    tbody.appendChild(row);
-                }});
-            }} else {{
-                const data = companyData[select]; const availableYears = getAvailableYears(select);
-                thead.innerHTML = `<tr><th>Year</th><th>CapEx</th><th>OCF</th><th>FCF</th><th>Debt Issued</th><th>Buybacks</th><th>Dividends</th></tr>`;
-                tbody.innerHTML = '';
-                availableYears.forEach(year => {{
-                    const f = data.funding[year]; if (!f) return;
-                    const coverage = (f.ocf / f.capex * 100).toFixed(0);
-                    const row = document.createElement('tr');
-                    row.innerHTML = `<td><span style="color:${{data.color}}">●</span> ${{year}}</td><td>$${{f.capex.toFixed(2)}}B</td><td>$${{f.ocf.toFixed(2)}}B <span style="color:#868e96;font-size:0.8em">(${{coverage}}%)</span></td><td class="${{f.fcf >= 0 ? 'growth-positive' : 'growth-negative'}}">$${{f.fcf.toFixed(2)}}B</td><td>${{f.debtIssue > 0 ? '$' + f.debtIssue.toFixed(2) + 'B' : '-'}}</td><td>${{f.buyback > 0 ? '$' + f.buyback.toFixed(2) + 'B' : '-'}}</td><td>${{f.dividend > 0 ? '$' + f.dividend.toFixed(2) + 'B' : '-'}}</td>`;
-                    tbody.appendChild(row);
-                }});
-            }}
-        }}
-
-        // Scroll to chart function with highlight effect
-        function scrollToChart(elementId) {{
-            const element = document.getElementById(elementId);
-            if (element) {{
-                const headerOffset = document.getElementById('stickyHeader').offsetHeight + 20;
-                const elementPosition = element.getBoundingClientRect().top;
-                const offsetPosition = elementPosition + window.pageYOffset - headerOffset;
-
-                window.scrollTo({{
-                    top: offsetPosition,
-                    behavior: 'smooth'
-                }});
-
-                // Add highlight effect
-                element.style.transition = 'box-shadow 0.3s ease, transform 0.3s ease';
-                element.style.boxShadow = '0 0 20px rgba(77, 171, 247, 0.6)';
-                element.style.transform = 'scale(1.01)';
-
-                setTimeout(() => {{
-                    element.style.boxShadow = '';
-                    element.style.transform = '';
-                }}, 1500);
-            }}
-        }}
-
-        initCharts();
-
-        // Sticky header scroll behavior
-        const stickyHeader = document.getElementById('stickyHeader');
-        const section32 = document.querySelector('h3.subsection-title:last-of-type');
-
-        window.addEventListener('scroll', function() {{
-            // Add shadow when scrolled
-            if (window.scrollY > 10) {{
-                stickyHeader.classList.add('scrolled');
-            }} else {{
-                stickyHeader.classList.remove('scrolled');
-            }}
-
-            // Stop sticky when section 3.2 is reached
-            const fundingPctSection = document.getElementById('fundingPctSection');
-            if (fundingPctSection) {{
-                const rect = fundingPctSection.getBoundingClientRect();
-                const headerHeight = stickyHeader.offsetHeight;
-                if (rect.top <= headerHeight + 50) {{
-                    stickyHeader.style.position = 'relative';
-                }} else {{
-                    stickyHeader.style.position = 'sticky';
-                }}
-            }}
-        }});
-    </script>
-</body>
-</html>'''
+        Args:
+            jobs: (plot method name, data argument or tuple of arguments, source JSON path) triples;
+                each writes its own PNG
+            force: Redraw every chart even if it is up to date
+            inline_svg: Also write the SVG copies generate_html_report inlines (risk report charts only)
+        """
+        settings = {"colors": self.colors, "dpi_single": self.dpi_single, "dpi_multi": self.dpi_multi,
+                    "sort_indicators": self.sort_indicators, "_inline_svg": inline_svg}
+        settings_hash = hashlib.blake2b(json.dumps(settings, sort_keys=True).encode("utf-8"),
+                                        digest_size=16).hexdigest()
+
+        fingerprints = self._read_fingerprints()
+        stale, previous_mtimes = [], {}
+        for job in jobs:
+            output_path = self._output_path(CHART_FILES[job[0]])
+            if (not force and self._is_fresh(output_path, [job[2], _MODULE_PATH])
+                    and self._fingerprint_matches(fingerprints, output_path, settings_hash)):
+                print(f"Up to date: {output_path}")
+                continue
+            stale.append(job)
+            previous_mtimes[output_path] = _mtime_ns(output_path)
+        jobs = stale
+
+        self._draw_charts(jobs, settings)
+
+        # Fingerprint only PNGs that were actually rewritten; a plot method with nothing to draw
+        # leaves any older PNG, which must not be marked as up to date. A failed redraw leaves
+        # a PNG whose mtime no longer matches its old entry
+        rewritten = {output_path: settings_hash for output_path, previous in previous_mtimes.items()
+                     if _mtime_ns(output_path) not in (None, previous)}
+        if rewritten:
+            self._update_fingerprints(rewritten)
+
+    def _draw_charts(self, jobs: List[Tuple[str, Dict, Path]], settings: Dict):
+        """Draw the given chart jobs, in worker processes when there is more than one"""
+        pool = None
+        workers = min(len(jobs), os.cpu_count() or 1, CHART_WORKERS)
+        if workers > 1:
+            try:
+                pool = ProcessPoolExecutor(max_workers=workers)
+            except (OSError, NotImplementedError) as e:
+                # No process support here (e.g. a sandbox without semaphores); draw in this process
+                print(f"Parallel chart rendering unavailable ({e}), rendering sequentially")
+
+        if pool is None:
+            inline_svg, self._inline_svg = self._inline_svg, settings["_inline_svg"]
+            try:
+                for method, data, _ in jobs:
+                    getattr(self, method)(*_chart_args(data))
+            finally:
+                self._inline_svg = inline_svg
+            return
 
-        # Save HTML
-        output_path = self.output_dir / "company_historical.html"
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write(html_content)
+        # A failing chart re-raises its worker's exception here rather than falling back
+        with pool:
+            futures = [pool.submit(_render_chart, self.output_dir, self.cache_dir, settings, method, data)
+                       for method, data, _ in jobs]
+            for future in futures:
+                future.result()
 
-        print(f"Saved: {output_path}")
-        return html_content
+    def generate_warning_dashboard(self, force_charts: bool = False):
+        """Generate complete warning system visualizations
 
-    def generate_warning_dashboard(self):
-        """Generate complete warning system visualizations"""
+        Args:
+            force_charts: Redraw charts whose PNGs are already newer than their inputs
+        """
         print("=" * 60)
         print("Generating Warning System Dashboard")
         print("=" * 60)
@@ -2181,7 +1759,7 @@ class RiskDashboard:
         warning_data = self.load_warning_dashboard()
         funding_health = self.load_funding_health()
         supply_demand = self.load_supply_demand()
-        credit_data = self.load_credit_market()
+        credit_data = self.load_credit_market(keys=CREDIT_TREND_SERIES)
 
         if warning_data is None:
             print("No warning dashboard data available. Run warning system first.")
@@ -2191,17 +1769,15 @@ class RiskDashboard:
         if MATPLOTLIB_AVAILABLE:
             print("\nGenerating warning charts...")
 
-            if warning_data:
-                self.plot_warning_signals(warning_data)
-
+            processed = self.processed_dir
+            jobs = [("plot_warning_signals", warning_data, processed / "warning_dashboard.json")] if warning_data else []
             if supply_demand:
-                self.plot_supply_demand_projection(supply_demand)
-
+                jobs.append(("plot_supply_demand_projection", supply_demand, processed / "supply_demand_analysis.json"))
             if funding_health:
-                self.plot_funding_health_gauge(funding_health)
-
+                jobs.append(("plot_funding_health_gauge", funding_health, processed / "funding_health_report.json"))
             if credit_data:
-                self.plot_credit_market_trends(credit_data)
+                jobs.append(("plot_credit_market_trends", credit_data, self.market_dir / "credit_market_data.json"))
+            self.render_charts(jobs, force=force_charts)
         else:
             print("\nSkipping charts - matplotlib not installed")
 
@@ -2211,11 +1787,12 @@ class RiskDashboard:
 
         print(f"\nAll warning outputs saved to: {self.output_dir}")
 
-    def generate_all(self, include_warning: bool = True):
+    def generate_all(self, include_warning: bool = True, force_charts: bool = False):
         """Generate all visualizations and reports
 
         Args:
             include_warning: Whether to include warning system dashboard
+            force_charts: Redraw charts whose PNGs are already newer than their inputs
         """
         print("=" * 60)
         print("Generating Visualizations")
@@ -2228,26 +1805,33 @@ class RiskDashboard:
         if assessment is None:
             print("No assessment data available. Run risk_calculator.py first.")
         else:
+            # The comparison chart and the report table share one ranking of the companies
+            ranked_profiles = _rank_profiles(assessment)
+
             # Generate plots
             if MATPLOTLIB_AVAILABLE:
                 print("\nGenerating risk assessment charts...")
-                self.plot_company_risk_comparison(assessment)
-                self.plot_risk_breakdown(assessment)
-                self.plot_indicator_heatmap(assessment)
-
+                assessment_path = self.processed_dir / "risk_assessment.json"
+                jobs = [
+                    ("plot_company_risk_comparison", (assessment, ranked_profiles), assessment_path),
+                    ("plot_risk_breakdown", assessment, assessment_path),
+                    ("plot_indicator_heatmap", assessment, assessment_path),
+                ]
                 if scenarios:
-                    self.plot_scenario_projections(scenarios)
+                    jobs.append(("plot_scenario_projections", scenarios,
+                                 self.processed_dir / "scenario_projections.json"))
+                self.render_charts(jobs, force=force_charts, inline_svg=True)
             else:
                 print("\nSkipping charts - matplotlib not installed")
 
             # Generate HTML report
             print("\nGenerating HTML report...")
-            self.generate_html_report(assessment, scenarios)
+            self.generate_html_report(assessment, scenarios, ranked_profiles)
 
         # Generate warning system dashboard
         if include_warning:
             print("\n")
-            self.generate_warning_dashboard()
+            self.generate_warning_dashboard(force_charts=force_charts)
 
         # Generate company historical dashboard
         consolidated_data = self.load_consolidated_data()
@@ -2258,6 +1842,46 @@ class RiskDashboard:
         print(f"\nAll outputs saved to: {self.output_dir}")
 
 
+def _render_chart(output_dir: Path, cache_dir: Path, settings: Dict, method: str, data):
+    """Worker entry point for render_charts: draw one chart with a fresh dashboard carrying the caller's settings"""
+    dashboard = RiskDashboard(output_dir, cache_dir)
+    for name, value in settings.items():
+        setattr(dashboard, name, value)
+    getattr(dashboard, method)(*_chart_args(data))
+
+
+def _chart_args(data) -> Tuple:
+    """Positional arguments of a render_charts job: its data, or the tuple of arguments it holds"""
+    return data if isinstance(data, tuple) else (data,)
+
+
+def _make_loader(dir_attr: str, filename: str, doc: str, missing_label: str = None):
+    """Build a load_* method reading `filename` from the directory held in `dir_attr`"""
+    def loader(self) -> Optional[Dict]:
+        return self._load_json(getattr(self, dir_attr) / filename, missing_label)
+
+    loader.__doc__ = doc
+    return loader
+
+
+# (method name, directory attribute, filename, docstring, label printed when missing)
+_LOADERS = [
+    ("load_assessment", "processed_dir", "risk_assessment.json", "Load risk assessment data", "Risk assessment"),
+    ("load_scenarios", "processed_dir", "scenario_projections.json", "Load scenario projections", None),
+    ("load_warning_dashboard", "processed_dir", "warning_dashboard.json", "Load warning system dashboard data", None),
+    ("load_funding_health", "processed_dir", "funding_health_report.json", "Load funding health report", None),
+    ("load_supply_demand", "processed_dir", "supply_demand_analysis.json", "Load supply-demand analysis", None),
+    ("load_consolidated_data", "processed_dir", "consolidated_data.json", "Load consolidated company data", None),
+]
+
+for _name, _dir_attr, _filename, _doc, _missing_label in _LOADERS:
+    _loader = _make_loader(_dir_attr, _filename, _doc, _missing_label)
+    _loader.__name__ = _name
+    _loader.__qualname__ = f"RiskDashboard.{_name}"
+    setattr(RiskDashboard, _name, _loader)
+del _name, _dir_attr, _filename, _doc, _missing_label, _loader
+
+
 def main():
     """Main function to generate visualizations"""
     dashboard = RiskDashboard()